@@ -0,0 +1,441 @@
+# Teste de Carga da API
+# Sobe a API local (src/api/main.py) sobre uma cópia com dados sintéticos,
+# dispara N clientes assíncronos com uma mistura de rotas reais e mede
+# vazão, latência, erros e integridade dos registros de preço.
+#
+# Uso:
+#   python scripts/teste_carga.py --workers 1,2,4 --clientes 1,10,50 --duracao 10
+#   python scripts/teste_carga.py --perfil escrita --clientes 20
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SRC_PATH = os.path.join(RAIZ, 'src')
+HOST = '127.0.0.1'
+
+
+# ============ DADOS SINTÉTICOS ============
+
+PRODUTOS = {
+    'blocos': [(1, 'Blocok 10', 97.75), (2, 'Blocok 13', 105.45), (3, 'Blocok 15', 112.95), (4, 'Blocok 20', 130.61)],
+    'eps': [(1, 'EPS 30mm', 7.95), (2, 'EPS 40mm', 10.60), (3, 'EPS 100mm', 26.50)]
+}
+
+
+def gerar_fornecedores(quantidade: int) -> dict:
+    """Gera um cadastro sintético de fornecedores"""
+    fornecedores = []
+    for i in range(1, quantidade + 1):
+        fornecedores.append({
+            'id': i,
+            'nome': f"Fornecedor Teste {i}",
+            'contato': f"Contato {i}",
+            'telefone': f"(11) 9{i:04d}-0000",
+            'whatsapp': f"(11) 9{i:04d}-0000",
+            'email': None,
+            'site': None,
+            'endereco': None,
+            'categorias': [random.choice(list(PRODUTOS))],
+            'ativo': True,
+            'data_cadastro': '2025-01-01'
+        })
+    return {'fornecedores': fornecedores}
+
+
+def gerar_registro(fornecedor: dict, data: str) -> dict:
+    """Gera um registro de preços sintético para um fornecedor"""
+    categoria = fornecedor['categorias'][0]
+    produtos = [
+        {'produto_id': pid, 'nome': nome, 'preco': round(preco * random.uniform(0.85, 1.25), 2)}
+        for pid, nome, preco in PRODUTOS[categoria]
+    ]
+    return {
+        'fornecedor_id': fornecedor['id'],
+        'categoria': categoria,
+        'produtos': produtos,
+        'data': data,
+        'observacao': 'Carga sintética'
+    }
+
+
+def gerar_historico(fornecedores: list, quantidade: int) -> dict:
+    """Gera um histórico sintético de preços espalhado em 24 meses"""
+    historico = []
+    for i in range(1, quantidade + 1):
+        fornecedor = random.choice(fornecedores)
+        data = f"{random.choice([2024, 2025])}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
+        registro = gerar_registro(fornecedor, data)
+        registro['id'] = i
+        historico.append(registro)
+    return {'historico': historico}
+
+
+def preparar_copia(num_fornecedores: int, num_registros: int) -> str:
+    """
+    Copia src/ para uma pasta temporária e grava os dados sintéticos nela,
+    para que os POSTs do teste não alterem os dados reais.
+
+    Returns:
+        Caminho da pasta temporária
+    """
+    pasta = tempfile.mkdtemp(prefix='teste_carga_')
+    destino = os.path.join(pasta, 'src')
+    shutil.copytree(SRC_PATH, destino, ignore=shutil.ignore_patterns('__pycache__'))
+
+    fornecedores = gerar_fornecedores(num_fornecedores)
+    dados_path = os.path.join(destino, 'shared', 'fornecedores', 'dados')
+    with open(os.path.join(dados_path, 'fornecedores.json'), 'w', encoding='utf-8') as f:
+        json.dump(fornecedores, f, ensure_ascii=False)
+    with open(os.path.join(dados_path, 'precos.json'), 'w', encoding='utf-8') as f:
+        json.dump(gerar_historico(fornecedores['fornecedores'], num_registros), f, ensure_ascii=False)
+
+    return pasta
+
+
+# ============ PERFIS DE CARGA ============
+
+def _medida():
+    """Medida aleatória, às vezes com unidade"""
+    return random.choice([f"{random.uniform(2, 8):.2f}", f"{random.randint(200, 800)}cm"])
+
+
+def rota_blocos_calcular(ctx):
+    params = {'largura': _medida(), 'altura': _medida(), 'bloco_id': random.randint(1, 4)}
+    return 'GET', '/api/blocos/calcular?' + urlencode(params), None
+
+
+def rota_blocos_calcular_todos(ctx):
+    params = {'largura': _medida(), 'altura': _medida()}
+    return 'GET', '/api/blocos/calcular-todos?' + urlencode(params), None
+
+
+def rota_eps_calcular_todos(ctx):
+    params = {'area': f"{random.uniform(10, 300):.1f}"}
+    return 'GET', '/api/eps/calcular-todos?' + urlencode(params), None
+
+
+def rota_precos_atuais(ctx):
+    params = {'categoria': random.choice(list(PRODUTOS))}
+    return 'GET', '/api/precos/atuais?' + urlencode(params), None
+
+
+def rota_precos_estatisticas(ctx):
+    params = {'categoria': random.choice(list(PRODUTOS)), 'meses': 12}
+    return 'GET', '/api/precos/estatisticas?' + urlencode(params), None
+
+
+def rota_fornecedores(ctx):
+    return 'GET', '/api/fornecedores', None
+
+
+def rota_precos_post(ctx):
+    fornecedor = random.choice(ctx['fornecedores'])
+    return 'POST', '/api/precos', gerar_registro(fornecedor, time.strftime('%Y-%m-%d'))
+
+
+# Peso de cada rota em cada perfil
+PERFIS = {
+    'leitura': [
+        (30, rota_blocos_calcular),
+        (15, rota_blocos_calcular_todos),
+        (25, rota_eps_calcular_todos),
+        (15, rota_precos_atuais),
+        (10, rota_precos_estatisticas),
+        (5, rota_fornecedores)
+    ],
+    'misto': [
+        (25, rota_blocos_calcular),
+        (10, rota_blocos_calcular_todos),
+        (20, rota_eps_calcular_todos),
+        (20, rota_precos_atuais),
+        (10, rota_precos_estatisticas),
+        (5, rota_fornecedores),
+        (10, rota_precos_post)
+    ],
+    'escrita': [
+        (20, rota_precos_atuais),
+        (80, rota_precos_post)
+    ]
+}
+
+
+# ============ CLIENTE HTTP ============
+
+async def requisicao(conexao: dict, metodo: str, caminho: str, corpo=None) -> tuple:
+    """
+    Faz uma requisição HTTP/1.1 com keep-alive sobre asyncio puro.
+
+    Returns:
+        Tupla (status, corpo em bytes)
+    """
+    if conexao.get('writer') is None:
+        conexao['reader'], conexao['writer'] = await asyncio.open_connection(HOST, conexao['porta'])
+
+    dados = json.dumps(corpo).encode('utf-8') if corpo is not None else b''
+    cabecalho = (
+        f"{metodo} {caminho} HTTP/1.1\r\n"
+        f"Host: {HOST}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(dados)}\r\n\r\n"
+    )
+    writer = conexao['writer']
+    reader = conexao['reader']
+    writer.write(cabecalho.encode('ascii') + dados)
+    await writer.drain()
+
+    linha_status = await reader.readline()
+    if not linha_status:
+        raise ConnectionError("Conexao fechada pelo servidor")
+    status = int(linha_status.split()[1])
+
+    tamanho = 0
+    fechar = False
+    while True:
+        linha = await reader.readline()
+        if linha in (b'\r\n', b''):
+            break
+        nome, _, valor = linha.decode('latin-1').partition(':')
+        nome = nome.strip().lower()
+        if nome == 'content-length':
+            tamanho = int(valor.strip())
+        elif nome == 'connection' and valor.strip().lower() == 'close':
+            fechar = True
+
+    resposta = await reader.readexactly(tamanho)
+    if fechar:
+        fechar_conexao(conexao)
+    return status, resposta
+
+
+def fechar_conexao(conexao: dict) -> None:
+    """Fecha a conexão de um cliente (reabre na próxima requisição)"""
+    if conexao.get('writer') is not None:
+        conexao['writer'].close()
+    conexao['writer'] = None
+    conexao['reader'] = None
+
+
+async def cliente(ctx: dict, rotas: list, pesos: list, fim: float, metricas: dict) -> None:
+    """Um cliente: dispara requisições em sequência até o fim do tempo"""
+    conexao = {'porta': ctx['porta']}
+    while time.perf_counter() < fim:
+        rota = random.choices(rotas, weights=pesos)[0]
+        metodo, caminho, corpo = rota(ctx)
+        nome = rota.__name__.replace('rota_', '')
+
+        inicio = time.perf_counter()
+        try:
+            status, _ = await requisicao(conexao, metodo, caminho, corpo)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            status = None
+            fechar_conexao(conexao)
+        latencia = (time.perf_counter() - inicio) * 1000
+
+        m = metricas.setdefault(nome, {'latencias': [], 'erros': 0, 'posts_ok': 0})
+        m['latencias'].append(latencia)
+        if status is None or status >= 400:
+            m['erros'] += 1
+        elif metodo == 'POST':
+            m['posts_ok'] += 1
+
+    fechar_conexao(conexao)
+
+
+# ============ RELATÓRIO ============
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil p (0-100) de uma lista já ordenada"""
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+def resumir(metricas: dict, duracao: float) -> dict:
+    """Consolida as métricas de um nível de carga"""
+    todas = sorted(l for m in metricas.values() for l in m['latencias'])
+    total = len(todas)
+    erros = sum(m['erros'] for m in metricas.values())
+
+    por_rota = {}
+    for nome, m in sorted(metricas.items()):
+        latencias = sorted(m['latencias'])
+        por_rota[nome] = {
+            'requisicoes': len(latencias),
+            'erros': m['erros'],
+            'p50_ms': round(percentil(latencias, 50), 2),
+            'p99_ms': round(percentil(latencias, 99), 2)
+        }
+
+    return {
+        'requisicoes': total,
+        'req_por_s': round(total / duracao, 1),
+        'erros': erros,
+        'taxa_erro_percent': round(erros / total * 100, 2) if total else 0.0,
+        'p50_ms': round(percentil(todas, 50), 2),
+        'p90_ms': round(percentil(todas, 90), 2),
+        'p99_ms': round(percentil(todas, 99), 2),
+        'max_ms': round(todas[-1], 2) if todas else 0.0,
+        'posts_ok': sum(m['posts_ok'] for m in metricas.values()),
+        'rotas': por_rota
+    }
+
+
+async def contar_registros(porta: int) -> tuple:
+    """
+    Total de registros de preço e IDs duplicados no histórico.
+
+    Returns:
+        Tupla (total, duplicados) ou (None, None) se o histórico não puder
+        ser lido (ex: precos.json corrompido por gravações concorrentes ou
+        servidor fora do ar)
+    """
+    conexao = {'porta': porta}
+    try:
+        status, corpo = await requisicao(conexao, 'GET', '/api/precos?fields=id')
+    except (OSError, ConnectionError, asyncio.IncompleteReadError):
+        return None, None
+    finally:
+        fechar_conexao(conexao)
+    if status != 200:
+        return None, None
+    ids = [r['id'] for r in json.loads(corpo)]
+    return len(ids), len(ids) - len(set(ids))
+
+
+async def executar_nivel(ctx: dict, perfil: str, clientes: int, duracao: float) -> dict:
+    """Roda um nível de carga (N clientes) e verifica a integridade dos POSTs"""
+    rotas = [r for _, r in PERFIS[perfil]]
+    pesos = [p for p, _ in PERFIS[perfil]]
+
+    registros_antes, _ = await contar_registros(ctx['porta'])
+
+    metricas = {}
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    await asyncio.gather(*(cliente(ctx, rotas, pesos, fim, metricas) for _ in range(clientes)))
+    duracao_real = time.perf_counter() - inicio
+
+    resumo = resumir(metricas, duracao_real)
+
+    registros_depois, duplicados = await contar_registros(ctx['porta'])
+    legivel = registros_antes is not None and registros_depois is not None
+    esperados = registros_antes + resumo['posts_ok'] if legivel else None
+    resumo['integridade'] = {
+        'historico_legivel': legivel,
+        'registros_esperados': esperados,
+        'registros_encontrados': registros_depois,
+        'registros_perdidos': esperados - registros_depois if legivel else None,
+        'ids_duplicados': duplicados
+    }
+    return resumo
+
+
+def imprimir_nivel(workers: int, clientes: int, resumo: dict) -> None:
+    """Imprime uma linha da tabela de resultados"""
+    integridade = resumo['integridade']
+    print(
+        f"{workers:>7} {clientes:>8} {resumo['req_por_s']:>9} "
+        f"{resumo['p50_ms']:>8} {resumo['p90_ms']:>8} {resumo['p99_ms']:>8} "
+        f"{resumo['taxa_erro_percent']:>7}% {resumo['posts_ok']:>6} "
+        f"{_ou_ilegivel(integridade['registros_perdidos']):>7} {_ou_ilegivel(integridade['ids_duplicados']):>6}"
+    )
+
+
+def _ou_ilegivel(valor) -> str:
+    """Valor de integridade ou aviso de histórico corrompido"""
+    return 'ILEGIVEL' if valor is None else str(valor)
+
+
+# ============ SERVIDOR ============
+
+def iniciar_servidor(pasta: str, porta: int, workers: int) -> subprocess.Popen:
+    """Sobe o uvicorn com a API da cópia temporária"""
+    comando = [
+        sys.executable, '-m', 'uvicorn', 'api.main:app',
+        '--app-dir', os.path.join(pasta, 'src'),
+        '--host', HOST, '--port', str(porta),
+        '--workers', str(workers),
+        '--log-level', 'warning'
+    ]
+    return subprocess.Popen(comando, cwd=pasta)
+
+
+async def aguardar_servidor(porta: int, timeout: float = 30.0) -> None:
+    """Espera a API responder antes de começar a carga"""
+    limite = time.perf_counter() + timeout
+    while time.perf_counter() < limite:
+        conexao = {'porta': porta}
+        try:
+            status, _ = await requisicao(conexao, 'GET', '/api/modulos')
+            fechar_conexao(conexao)
+            if status == 200:
+                return
+        except (OSError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"API nao respondeu na porta {porta} em {timeout}s")
+
+
+def _lista_inteiros(valor: str) -> list:
+    return [int(v) for v in valor.split(',') if v.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teste de carga da API de materiais")
+    parser.add_argument('--workers', type=_lista_inteiros, default=[1], help="workers do uvicorn (ex: 1,2,4)")
+    parser.add_argument('--clientes', type=_lista_inteiros, default=[1, 10, 50], help="clientes concorrentes (ex: 1,10,50)")
+    parser.add_argument('--duracao', type=float, default=10.0, help="segundos por nivel de carga")
+    parser.add_argument('--perfil', choices=sorted(PERFIS), default='misto')
+    parser.add_argument('--fornecedores', type=int, default=50, help="fornecedores sinteticos")
+    parser.add_argument('--registros', type=int, default=1000, help="registros de preco sinteticos")
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--saida', help="grava o resultado completo em JSON")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    pasta = preparar_copia(args.fornecedores, args.registros)
+    with open(os.path.join(pasta, 'src', 'shared', 'fornecedores', 'dados', 'fornecedores.json'), encoding='utf-8') as f:
+        fornecedores = json.load(f)['fornecedores']
+
+    print(f"Perfil: {args.perfil} | {args.duracao}s por nivel | "
+          f"{args.fornecedores} fornecedores, {args.registros} registros sinteticos")
+    print(f"{'workers':>7} {'clientes':>8} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+          f"{'erros':>8} {'posts':>6} {'perdidos':>7} {'dupl':>6}")
+
+    resultados = []
+    try:
+        for workers in args.workers:
+            servidor = iniciar_servidor(pasta, args.porta, workers)
+            try:
+                asyncio.run(aguardar_servidor(args.porta))
+                ctx = {'porta': args.porta, 'fornecedores': fornecedores}
+                for clientes in args.clientes:
+                    resumo = asyncio.run(executar_nivel(ctx, args.perfil, clientes, args.duracao))
+                    resumo.update({'workers': workers, 'clientes': clientes})
+                    resultados.append(resumo)
+                    imprimir_nivel(workers, clientes, resumo)
+            finally:
+                servidor.terminate()
+                servidor.wait()
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
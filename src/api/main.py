@@ -1,6 +1,7 @@
 # API Principal - FastAPI
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse
 import os
 import sys
@@ -8,14 +9,16 @@ import sys
 # Adiciona o src ao path para imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from modulos.blocos.calculadora import calcular_blocos, carregar_blocos
-from modulos.eps.calculadora import calcular_eps, carregar_eps
 from shared.fornecedores.gerenciador import (
     listar_fornecedores, buscar_fornecedor, adicionar_fornecedor, atualizar_fornecedor,
-    buscar_precos_atuais, adicionar_registro_precos, historico_por_produto, listar_historico_completo
+    buscar_precos_atuais, adicionar_registro_precos, historico_por_produto, listar_historico_completo,
+    estatisticas_precos, buscar_texto, registrar_catalogo_produtos
 )
+from api.registro import descobrir_modulos, carregar_modulo, listar_modulos, listar_ids, modulos_carregados
+from shared.utils.projecao import projetar_campos
+from shared.utils.medidas import interpretar_medida, interpretar_area, interpretar_lote_dimensoes, interpretar_lote_areas
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Union
 
 app = FastAPI(
     title="Calculadora de Materiais - Construcao Civil",
@@ -23,6 +26,27 @@ app = FastAPI(
     version="1.1.0"
 )
 
+# Compressao gzip para respostas grandes (negociada via Accept-Encoding)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Registra os modulos de materiais (carregados so no primeiro uso)
+descobrir_modulos()
+
+# Conversores dos parametros de medida declarados pelos modulos
+INTERPRETADORES = {
+    'medida': interpretar_medida,
+    'area': interpretar_area
+}
+
+
+def _modulo(nome: str) -> dict:
+    """Descritor de um modulo de materiais (carregado no primeiro uso)"""
+    descritor = carregar_modulo(nome)
+    if not descritor:
+        raise ValueError(f"Modulo '{nome}' indisponivel")
+    return descritor
+
+
 # Servir arquivos estaticos (frontend)
 FRONTEND_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'frontend')
 if os.path.exists(FRONTEND_PATH):
@@ -41,73 +65,298 @@ async def home():
 # ============ BLOCOS ============
 
 @app.get("/api/blocos")
-async def listar_blocos():
-    """Lista todos os blocos disponiveis"""
-    dados = carregar_blocos()
-    return dados
+async def listar_blocos(fields: str = None):
+    """
+    Lista todos os blocos disponiveis
+
+    - **fields**: campos a retornar (ex: blocos.id,blocos.nome,blocos.preco_avista)
+    """
+    try:
+        dados = _modulo('blocos')['carregar']()
+    except ValueError as e:
+        return {"error": str(e)}
+    return projetar_campos(dados, fields)
 
 
 @app.get("/api/blocos/calcular")
-async def calcular_bloco(largura: float, altura: float, bloco_id: int = 1):
+async def calcular_bloco(
+    largura: str,
+    altura: str,
+    bloco_id: int = 1,
+    as_of: str = None,
+    fornecedor_id: int = None,
+    fields: str = None
+):
     """
     Calcula quantidade de blocos para uma parede
 
-    - **largura**: largura da parede em metros
-    - **altura**: altura da parede em metros
+    - **largura**: largura da parede (metros, ou com unidade: 280cm, 900 mm)
+    - **altura**: altura da parede (metros, ou com unidade: 280cm, 900 mm)
     - **bloco_id**: tipo do bloco (1=10cm, 2=13cm, 3=15cm, 4=20cm)
+    - **as_of**: data YYYY-MM-DD para usar os precos vigentes nesse dia
+    - **fornecedor_id**: fornecedor do preco historico (sem as_of, o ultimo preco dele)
+    - **fields**: campos a retornar (ex: bloco,quantidade,custo_total)
     """
-    resultado = calcular_blocos(largura, altura, bloco_id)
-    return resultado
+    try:
+        largura_m = interpretar_medida(largura)
+        altura_m = interpretar_medida(altura)
+        resultado = _modulo('blocos')['calcular'](largura_m, altura_m, bloco_id, as_of, fornecedor_id)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return projetar_campos(resultado, fields)
 
 
 @app.get("/api/blocos/calcular-todos")
-async def calcular_todos_blocos(largura: float, altura: float):
+async def calcular_todos_blocos(
+    largura: str,
+    altura: str,
+    as_of: str = None,
+    fornecedor_id: int = None,
+    fields: str = None
+):
     """
     Calcula quantidade de blocos para todos os tipos
 
-    - **largura**: largura da parede em metros
-    - **altura**: altura da parede em metros
+    - **largura**: largura da parede (metros, ou com unidade: 280cm, 900 mm)
+    - **altura**: altura da parede (metros, ou com unidade: 280cm, 900 mm)
+    - **as_of**: data YYYY-MM-DD para usar os precos vigentes nesse dia
+    - **fornecedor_id**: fornecedor do preco historico (sem as_of, o ultimo preco dele)
+    - **fields**: campos a retornar (ex: bloco,quantidade,custo_total)
+    """
+    try:
+        largura_m = interpretar_medida(largura)
+        altura_m = interpretar_medida(altura)
+        resultados = []
+        descritor = _modulo('blocos')
+        for bloco_id in listar_ids(descritor):
+            resultado = descritor['calcular'](largura_m, altura_m, bloco_id, as_of, fornecedor_id)
+            resultados.append(resultado)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return projetar_campos(resultados, fields)
+
+
+class LoteParedes(BaseModel):
+    paredes: List[Union[str, List[Union[float, str]]]]
+    bloco_id: int = 1
+    unidade: str = "m"
+    as_of: Optional[str] = None
+    fornecedor_id: Optional[int] = None
+
+
+@app.post("/api/blocos/calcular-lote")
+async def calcular_lote_blocos(lote: LoteParedes, fields: str = None):
+    """
+    Calcula blocos para varias paredes de um levantamento
+
+    - **paredes**: lista de dimensoes ("3.5x2.8 m", "350 x 280 cm") ou pares [largura, altura]
+    - **bloco_id**: tipo do bloco
+    - **unidade**: unidade das medidas sem unidade explicita (mm, cm ou m)
+    - **as_of**: data YYYY-MM-DD para usar os precos vigentes nesse dia
     """
-    resultados = []
-    for bloco_id in [1, 2, 3, 4]:
-        resultado = calcular_blocos(largura, altura, bloco_id)
-        resultados.append(resultado)
-    return resultados
+    try:
+        dimensoes = interpretar_lote_dimensoes(lote.paredes, lote.unidade)
+        # Catalogo lido uma vez para o lote inteiro
+        descritor = _modulo('blocos')
+        catalogo = descritor['carregar']()
+        resultados = [
+            descritor['calcular'](largura, altura, lote.bloco_id, lote.as_of, lote.fornecedor_id, dados=catalogo)
+            for largura, altura in dimensoes
+        ]
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return {
+        'paredes': projetar_campos(resultados, fields),
+        'quantidade_total': sum(r['quantidade'] for r in resultados),
+        'custo_total': sum(r['custo_total'] for r in resultados)
+    }
 
 
 # ============ EPS ============
 
 @app.get("/api/eps")
-async def listar_eps():
-    """Lista todos os produtos EPS disponiveis"""
-    dados = carregar_eps()
-    return dados
+async def listar_eps(fields: str = None):
+    """
+    Lista todos os produtos EPS disponiveis
+
+    - **fields**: campos a retornar (ex: produtos.id,produtos.nome,produtos.preco_m2)
+    """
+    try:
+        dados = _modulo('eps')['carregar']()
+    except ValueError as e:
+        return {"error": str(e)}
+    return projetar_campos(dados, fields)
 
 
 @app.get("/api/eps/calcular")
-async def calcular_placa_eps(area: float, produto_id: int = 1):
+async def calcular_placa_eps(
+    area: str,
+    produto_id: int = 1,
+    as_of: str = None,
+    fornecedor_id: int = None,
+    fields: str = None
+):
     """
     Calcula quantidade de placas EPS para uma area
 
-    - **area**: area em metros quadrados
+    - **area**: area em m² (ou com unidade: 120 m2, 10x12 m)
     - **produto_id**: tipo do EPS (1=30mm, 2=40mm, 3=100mm)
+    - **as_of**: data YYYY-MM-DD para usar precos, frete e desconto vigentes nesse dia
+    - **fornecedor_id**: fornecedor do preco historico (sem as_of, o ultimo preco dele)
+    - **fields**: campos a retornar (ex: produto,quantidade_placas,custo_total)
     """
-    resultado = calcular_eps(area, produto_id)
-    return resultado
+    try:
+        area_m2 = interpretar_area(area)
+        resultado = _modulo('eps')['calcular'](area_m2, produto_id, as_of, fornecedor_id)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return projetar_campos(resultado, fields)
 
 
 @app.get("/api/eps/calcular-todos")
-async def calcular_todos_eps(area: float):
+async def calcular_todos_eps(
+    area: str,
+    as_of: str = None,
+    fornecedor_id: int = None,
+    fields: str = None
+):
     """
     Calcula quantidade de EPS para todos os tipos
 
-    - **area**: area em metros quadrados
+    - **area**: area em m² (ou com unidade: 120 m2, 10x12 m)
+    - **as_of**: data YYYY-MM-DD para usar precos, frete e desconto vigentes nesse dia
+    - **fornecedor_id**: fornecedor do preco historico (sem as_of, o ultimo preco dele)
+    - **fields**: campos a retornar (ex: produto,quantidade_placas,custo_total)
+    """
+    try:
+        area_m2 = interpretar_area(area)
+        resultados = []
+        descritor = _modulo('eps')
+        for produto_id in listar_ids(descritor):
+            resultado = descritor['calcular'](area_m2, produto_id, as_of, fornecedor_id)
+            resultados.append(resultado)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return projetar_campos(resultados, fields)
+
+
+class LoteAreas(BaseModel):
+    areas: List[Union[float, str]]
+    produto_id: int = 1
+    as_of: Optional[str] = None
+    fornecedor_id: Optional[int] = None
+
+
+@app.post("/api/eps/calcular-lote")
+async def calcular_lote_eps(lote: LoteAreas, fields: str = None):
+    """
+    Calcula placas EPS para varias areas de um levantamento
+
+    - **areas**: lista de areas (120, "120 m2", "10x12 m")
+    - **produto_id**: tipo do EPS
+    - **as_of**: data YYYY-MM-DD para usar os precos vigentes nesse dia
+    """
+    try:
+        areas = interpretar_lote_areas(lote.areas)
+        # Catalogo lido uma vez para o lote inteiro
+        descritor = _modulo('eps')
+        catalogo = descritor['carregar']()
+        resultados = [
+            descritor['calcular'](area, lote.produto_id, lote.as_of, lote.fornecedor_id, dados=catalogo)
+            for area in areas
+        ]
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return {
+        'areas': projetar_campos(resultados, fields),
+        'quantidade_placas_total': sum(r['quantidade_placas'] for r in resultados),
+        'custo_placas_total': sum(r['custo_placas'] for r in resultados)
+    }
+
+
+# ============ MODULOS ============
+
+@app.get("/api/modulos")
+async def api_listar_modulos():
+    """Lista os modulos de materiais e o tempo de carga de cada um"""
+    return listar_modulos()
+
+
+def _interpretar_parametros(descritor: dict, request: Request) -> list:
+    """Le da query string os parametros de medida declarados pelo modulo"""
+    valores = []
+    for nome, tipo in descritor['parametros'].items():
+        valor = request.query_params.get(nome)
+        if valor is None:
+            raise ValueError(f"Parametro '{nome}' obrigatorio")
+        valores.append(INTERPRETADORES[tipo](valor))
+    return valores
+
+
+@app.get("/api/{modulo}/calcular")
+async def api_calcular_modulo(
+    modulo: str,
+    request: Request,
+    as_of: str = None,
+    fornecedor_id: int = None,
+    fields: str = None
+):
     """
-    resultados = []
-    for produto_id in [1, 2, 3]:
-        resultado = calcular_eps(area, produto_id)
-        resultados.append(resultado)
-    return resultados
+    Calcula a quantidade de material para qualquer modulo registrado
+
+    Os parametros dependem do modulo (ex: largura/altura/bloco_id para
+    blocos, area/produto_id para eps) - veja /api/modulos.
+
+    - **as_of**: data YYYY-MM-DD para usar os precos vigentes nesse dia
+    - **fornecedor_id**: fornecedor do preco historico (sem as_of, o ultimo preco dele)
+    """
+    descritor = carregar_modulo(modulo)
+    if not descritor:
+        return {"error": "Modulo nao encontrado"}
+
+    try:
+        valores = _interpretar_parametros(descritor, request)
+        item_id = int(request.query_params.get(descritor['parametro_id'], 1))
+        resultado = descritor['calcular'](*valores, item_id, as_of, fornecedor_id)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return projetar_campos(resultado, fields)
+
+
+@app.get("/api/{modulo}/calcular-todos")
+async def api_calcular_todos_modulo(
+    modulo: str,
+    request: Request,
+    as_of: str = None,
+    fornecedor_id: int = None,
+    fields: str = None
+):
+    """
+    Calcula a quantidade de material para todos os itens do catalogo do modulo
+
+    - **as_of**: data YYYY-MM-DD para usar os precos vigentes nesse dia
+    - **fornecedor_id**: fornecedor do preco historico (sem as_of, o ultimo preco dele)
+    """
+    descritor = carregar_modulo(modulo)
+    if not descritor:
+        return {"error": "Modulo nao encontrado"}
+
+    try:
+        valores = _interpretar_parametros(descritor, request)
+        resultados = []
+        for item_id in listar_ids(descritor):
+            resultados.append(descritor['calcular'](*valores, item_id, as_of, fornecedor_id))
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return projetar_campos(resultados, fields)
 
 
 # ============ FORNECEDORES ============
@@ -160,9 +409,9 @@ class RegistroPrecos(BaseModel):
 
 
 @app.get("/api/fornecedores")
-async def api_listar_fornecedores(apenas_ativos: bool = True):
+async def api_listar_fornecedores(apenas_ativos: bool = True, fields: str = None):
     """Lista todos os fornecedores cadastrados"""
-    return listar_fornecedores(apenas_ativos)
+    return projetar_campos(listar_fornecedores(apenas_ativos), fields)
 
 
 @app.get("/api/fornecedores/{fornecedor_id}")
@@ -194,32 +443,79 @@ async def api_atualizar_fornecedor(fornecedor_id: int, dados: FornecedorUpdate):
 # ============ PRECOS ============
 
 @app.get("/api/precos")
-async def api_listar_historico():
+async def api_listar_historico(fields: str = None):
     """Lista todo o historico de precos"""
-    return listar_historico_completo()
+    return projetar_campos(listar_historico_completo(), fields)
 
 
 @app.get("/api/precos/atuais")
-async def api_precos_atuais(fornecedor_id: int = None, categoria: str = None):
-    """Busca os precos mais recentes"""
-    return buscar_precos_atuais(fornecedor_id, categoria)
+async def api_precos_atuais(
+    fornecedor_id: int = None,
+    categoria: str = None,
+    as_of: str = None,
+    fields: str = None
+):
+    """
+    Busca os precos mais recentes
+
+    - **as_of**: data YYYY-MM-DD para buscar os precos vigentes nesse dia
+    """
+    try:
+        precos = buscar_precos_atuais(fornecedor_id, categoria, as_of)
+    except ValueError as e:
+        return {"error": str(e)}
+    return projetar_campos(precos, fields)
+
+
+@app.get("/api/precos/estatisticas")
+async def api_estatisticas_precos(
+    categoria: str = None,
+    produto_id: int = None,
+    fornecedor_id: int = None,
+    desde: str = None,
+    ate: str = None,
+    meses: int = None,
+    fields: str = None
+):
+    """
+    Estatisticas mensais de preco por produto e fornecedor
+
+    - **categoria**: filtra por categoria (blocos, eps, ...)
+    - **produto_id**: filtra por produto
+    - **fornecedor_id**: filtra por fornecedor
+    - **desde** / **ate**: intervalo de meses (YYYY-MM)
+    - **meses**: janela dos ultimos N meses (ex: 12)
+    - **fields**: campos a retornar (ex: fornecedor_id,nome,resumo.media)
+    """
+    try:
+        resultado = estatisticas_precos(categoria, produto_id, fornecedor_id, desde, ate, meses)
+    except ValueError as e:
+        return {"error": str(e)}
+    return projetar_campos(resultado, fields)
 
 
 @app.post("/api/precos")
 async def api_adicionar_precos(registro: RegistroPrecos):
-    """Registra novos precos no historico"""
+    """
+    Registra novos precos no historico
+
+    - **data**: YYYY-MM-DD (default hoje); datas invalidas retornam erro
+    """
     produtos = [p.dict() for p in registro.produtos]
     frete = [f.dict() for f in registro.frete] if registro.frete else None
 
-    return adicionar_registro_precos(
-        fornecedor_id=registro.fornecedor_id,
-        categoria=registro.categoria,
-        produtos=produtos,
-        data=registro.data,
-        observacao=registro.observacao,
-        frete=frete,
-        desconto_avista_percent=registro.desconto_avista_percent
-    )
+    try:
+        return adicionar_registro_precos(
+            fornecedor_id=registro.fornecedor_id,
+            categoria=registro.categoria,
+            produtos=produtos,
+            data=registro.data,
+            observacao=registro.observacao,
+            frete=frete,
+            desconto_avista_percent=registro.desconto_avista_percent
+        )
+    except ValueError as e:
+        return {"error": str(e)}
 
 
 @app.get("/api/precos/historico/{categoria}/{produto_id}")
@@ -228,6 +524,39 @@ async def api_historico_produto(categoria: str, produto_id: int):
     return historico_por_produto(categoria, produto_id)
 
 
+# ============ BUSCA ============
+
+def _registrar_catalogos() -> None:
+    """
+    Inclui na busca os catalogos dos modulos ja carregados
+
+    Nao importa modulos so para a busca: o catalogo de um modulo entra no
+    indice depois do primeiro uso dele. Catalogos ja registrados sao ignorados,
+    e a busca so confere o mtime de cada um e rele o que mudou.
+    """
+    for nome, descritor in modulos_carregados().items():
+        registrar_catalogo_produtos(
+            nome,
+            descritor['dados_path'],
+            lambda d=descritor: d['carregar']()[d['chave_itens']]
+        )
+
+
+@app.get("/api/busca")
+async def api_busca(q: str, tipo: str = None, pagina: int = 1, por_pagina: int = 20, fields: str = None):
+    """
+    Busca textual em fornecedores, produtos e historico de precos
+
+    - **q**: texto buscado (sem distincao de acentos e maiusculas)
+    - **tipo**: fornecedor, produto ou registro (opcional)
+    - **pagina** / **por_pagina**: paginacao dos resultados
+    - **fields**: campos a retornar (ex: total,resultados.titulo,resultados.tipo)
+    """
+    _registrar_catalogos()
+    resultado = buscar_texto(q, tipo, max(pagina, 1), min(max(por_pagina, 1), 100))
+    return projetar_campos(resultado, fields)
+
+
 # Para rodar: uvicorn src.api.main:app --reload
 if __name__ == "__main__":
     import uvicorn
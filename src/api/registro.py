@@ -0,0 +1,95 @@
+# Registro de Módulos de Materiais
+# Descobre os módulos em src/modulos/ e carrega cada um só no primeiro uso
+
+import importlib
+import os
+import time
+from typing import Optional
+
+# Pasta dos módulos de negócio
+MODULOS_PATH = os.path.join(os.path.dirname(__file__), '..', 'modulos')
+
+# Estado de cada módulo descoberto (nome -> status)
+_registro = {}
+
+
+def descobrir_modulos() -> list:
+    """
+    Procura módulos em src/modulos/ (pastas com calculadora.py).
+
+    Não importa nada, só registra os nomes encontrados.
+
+    Returns:
+        Lista com os nomes dos módulos
+    """
+    for nome in sorted(os.listdir(MODULOS_PATH)):
+        if nome in _registro or nome.startswith(('_', '.')):
+            continue
+        if os.path.isfile(os.path.join(MODULOS_PATH, nome, 'calculadora.py')):
+            _registro[nome] = {
+                'nome': nome,
+                'carregado': False,
+                'tempo_carga_ms': None,
+                'erro': None,
+                'descritor': None
+            }
+    return list(_registro)
+
+
+def carregar_modulo(nome: str) -> Optional[dict]:
+    """
+    Retorna o descritor MODULO de um módulo, importando-o no primeiro uso.
+
+    Args:
+        nome: nome da pasta do módulo (blocos, eps, ...)
+
+    Returns:
+        Descritor do módulo ou None se não existir/falhar ao carregar
+    """
+    if nome not in _registro:
+        # Módulo pode ter sido adicionado depois da inicialização
+        descobrir_modulos()
+
+    status = _registro.get(nome)
+    if status is None:
+        return None
+    if status['carregado'] or status['erro']:
+        return status['descritor']
+
+    inicio = time.perf_counter()
+    try:
+        calculadora = importlib.import_module(f"modulos.{nome}.calculadora")
+        status['descritor'] = calculadora.MODULO
+        status['carregado'] = True
+    except Exception as e:
+        status['erro'] = str(e)
+    status['tempo_carga_ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+
+    return status['descritor']
+
+
+def listar_modulos() -> list:
+    """Lista os módulos descobertos com estado de carga e tempo de carga"""
+    descobrir_modulos()
+    modulos = []
+    for status in _registro.values():
+        descritor = status['descritor'] or {}
+        modulos.append({
+            'nome': status['nome'],
+            'descricao': descritor.get('descricao'),
+            'carregado': status['carregado'],
+            'tempo_carga_ms': status['tempo_carga_ms'],
+            'erro': status['erro']
+        })
+    return modulos
+
+
+def modulos_carregados() -> dict:
+    """Descritores dos módulos já importados (nome -> descritor), sem importar nenhum"""
+    return {nome: status['descritor'] for nome, status in _registro.items() if status['carregado']}
+
+
+def listar_ids(descritor: dict) -> list:
+    """IDs de todos os itens do catálogo de um módulo"""
+    dados = descritor['carregar']()
+    return [item['id'] for item in dados[descritor['chave_itens']]]
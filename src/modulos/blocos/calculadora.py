@@ -30,7 +30,14 @@ def listar_blocos():
         print(f"    Uso: {bloco['aplicacao']}")
 
 
-def calcular_blocos(largura_parede: float, altura_parede: float, bloco_id: int = 1) -> dict:
+def calcular_blocos(
+    largura_parede: float,
+    altura_parede: float,
+    bloco_id: int = 1,
+    as_of: str = None,
+    fornecedor_id: int = None,
+    dados: dict = None
+) -> dict:
     """
     Calcula quantos blocos são necessários para uma parede.
 
@@ -38,11 +45,17 @@ def calcular_blocos(largura_parede: float, altura_parede: float, bloco_id: int =
         largura_parede: largura da parede em metros
         altura_parede: altura da parede em metros
         bloco_id: ID do tipo de bloco (1=10cm, 2=13cm, 3=15cm, 4=20cm)
+        as_of: data YYYY-MM-DD; usa o preço do histórico vigente nesse dia
+               em vez do preço do catálogo (opcional)
+        fornecedor_id: fornecedor do preço histórico; sem as_of usa o
+                       último preço registrado dele (opcional)
+        dados: catálogo já carregado, para cálculos em lote (default: lê o JSON)
 
     Returns:
         Dicionário com quantidade, custo e detalhes
     """
-    dados = carregar_blocos()
+    if dados is None:
+        dados = carregar_blocos()
 
     # Encontra o bloco pelo ID
     bloco = None
@@ -64,19 +77,53 @@ def calcular_blocos(largura_parede: float, altura_parede: float, bloco_id: int =
     # Quantidade de blocos
     quantidade = math.ceil(area_parede / area_bloco)
 
+    # Preço do catálogo ou o do histórico (vigente na data / do fornecedor)
+    preco_unitario = bloco['preco_avista']
+    referencia = None
+    if as_of or fornecedor_id:
+        # Import local: a calculadora também roda sozinha (python calculadora.py)
+        from shared.fornecedores.gerenciador import buscar_preco_produto
+
+        vigente = buscar_preco_produto('blocos', bloco_id, fornecedor_id, as_of)
+        if not vigente:
+            quando = f" em {as_of}" if as_of else ""
+            raise ValueError(f"Sem preço registrado para {bloco['nome']}{quando}")
+        preco_unitario = vigente['produto']['preco']
+        referencia = {
+            'data': vigente['registro']['data'],
+            'fornecedor_id': vigente['registro']['fornecedor_id'],
+            'registro_id': vigente['registro']['id']
+        }
+
     # Custo total
-    custo_total = quantidade * bloco['preco_avista']
+    custo_total = quantidade * preco_unitario
 
-    return {
+    resultado = {
         'bloco': bloco['nome'],
         'area_parede_m2': area_parede,
         'area_bloco_m2': area_bloco,
         'quantidade': quantidade,
-        'preco_unitario': bloco['preco_avista'],
+        'preco_unitario': preco_unitario,
         'custo_total': custo_total,
         'peso_total_kg': quantidade * bloco['peso_kg'],
         'aplicacao': bloco['aplicacao']
     }
+    if referencia:
+        resultado['preco_referencia'] = referencia
+
+    return resultado
+
+
+# Descritor usado pelo registro de módulos da API
+MODULO = {
+    'descricao': 'Blocos Blocok para paredes',
+    'dados_path': DADOS_PATH,
+    'carregar': carregar_blocos,
+    'chave_itens': 'blocos',
+    'calcular': calcular_blocos,
+    'parametros': {'largura': 'medida', 'altura': 'medida'},
+    'parametro_id': 'bloco_id'
+}
 
 
 # Teste rápido
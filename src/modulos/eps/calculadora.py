@@ -34,18 +34,22 @@ def listar_eps():
         print(f"    Uso: {produto['aplicacao']}")
 
 
-def calcular_frete(valor_total: float) -> dict:
+def calcular_frete(valor_total: float, tabela_frete: list = None, dados: dict = None) -> dict:
     """
     Calcula o frete baseado no valor total do pedido.
 
     Args:
         valor_total: valor total das placas em reais
+        tabela_frete: faixas de frete (default: tabela do catálogo)
+        dados: catálogo já carregado (default: lê o JSON)
 
     Returns:
         Dicionário com valor do frete e observação
     """
-    dados = carregar_eps()
-    tabela_frete = dados['frete']['tabela']
+    if dados is None:
+        dados = carregar_eps()
+    if tabela_frete is None:
+        tabela_frete = dados['frete']['tabela']
 
     for faixa in tabela_frete:
         valor_min = faixa['valor_min']
@@ -71,18 +75,41 @@ def calcular_frete(valor_total: float) -> dict:
     return {'valor': None, 'obs': 'Consultar'}
 
 
-def calcular_eps(area_m2: float, produto_id: int = 1) -> dict:
+def _tabela_frete_registro(frete: list) -> list:
+    """Converte a tabela de frete de um registro de preços para o formato do catálogo"""
+    tabela = []
+    for faixa in frete:
+        item = {'valor_min': faixa['min'], 'valor_max': faixa.get('max'), 'frete': faixa.get('valor')}
+        if faixa.get('obs'):
+            item['obs'] = faixa['obs']
+        tabela.append(item)
+    return tabela
+
+
+def calcular_eps(
+    area_m2: float,
+    produto_id: int = 1,
+    as_of: str = None,
+    fornecedor_id: int = None,
+    dados: dict = None
+) -> dict:
     """
     Calcula quantas placas de EPS são necessárias para uma área.
 
     Args:
         area_m2: área a ser coberta em metros quadrados
         produto_id: ID do tipo de EPS (1=30mm, 2=40mm, 3=100mm)
+        as_of: data YYYY-MM-DD; usa preço, frete e desconto do histórico
+               vigentes nesse dia em vez do catálogo (opcional)
+        fornecedor_id: fornecedor do preço histórico; sem as_of usa o
+                       último preço registrado dele (opcional)
+        dados: catálogo já carregado, para cálculos em lote (default: lê o JSON)
 
     Returns:
         Dicionário com quantidade, custo e detalhes
     """
-    dados = carregar_eps()
+    if dados is None:
+        dados = carregar_eps()
 
     # Encontra o produto pelo ID
     produto = None
@@ -100,11 +127,38 @@ def calcular_eps(area_m2: float, produto_id: int = 1) -> dict:
     # Quantidade de placas (arredonda pra cima)
     quantidade = math.ceil(area_m2 / area_placa)
 
+    # Preços do catálogo ou os do histórico (vigentes na data / do fornecedor)
+    preco_unitario = produto['preco_unitario']
+    preco_m2 = produto['preco_m2']
+    desconto_percent = dados['fabricante']['desconto_avista_percent']
+    tabela_frete = None
+    referencia = None
+    if as_of or fornecedor_id:
+        # Import local: a calculadora também roda sozinha (python calculadora.py)
+        from shared.fornecedores.gerenciador import buscar_preco_produto
+
+        vigente = buscar_preco_produto('eps', produto_id, fornecedor_id, as_of)
+        if not vigente:
+            quando = f" em {as_of}" if as_of else ""
+            raise ValueError(f"Sem preço registrado para {produto['nome']}{quando}")
+        registro = vigente['registro']
+        preco_unitario = vigente['produto']['preco']
+        preco_m2 = vigente['produto'].get('preco_m2') or round(preco_unitario / area_placa, 2)
+        if registro.get('desconto_avista_percent') is not None:
+            desconto_percent = registro['desconto_avista_percent']
+        if registro.get('frete'):
+            tabela_frete = _tabela_frete_registro(registro['frete'])
+        referencia = {
+            'data': registro['data'],
+            'fornecedor_id': registro['fornecedor_id'],
+            'registro_id': registro['id']
+        }
+
     # Custo total das placas
-    custo_placas = quantidade * produto['preco_unitario']
+    custo_placas = quantidade * preco_unitario
 
     # Calcula frete
-    frete_info = calcular_frete(custo_placas)
+    frete_info = calcular_frete(custo_placas, tabela_frete, dados)
 
     # Custo total com frete
     custo_total = custo_placas
@@ -112,18 +166,17 @@ def calcular_eps(area_m2: float, produto_id: int = 1) -> dict:
         custo_total += frete_info['valor']
 
     # Desconto à vista
-    desconto_percent = dados['fabricante']['desconto_avista_percent']
     custo_avista = custo_placas * (1 - desconto_percent / 100)
 
-    return {
+    resultado = {
         'produto': produto['nome'],
         'espessura_mm': produto['espessura_mm'],
         'area_solicitada_m2': area_m2,
         'area_placa_m2': area_placa,
         'quantidade_placas': quantidade,
         'area_total_m2': quantidade * area_placa,
-        'preco_unitario': produto['preco_unitario'],
-        'preco_m2': produto['preco_m2'],
+        'preco_unitario': preco_unitario,
+        'preco_m2': preco_m2,
         'custo_placas': custo_placas,
         'custo_avista': custo_avista,
         'desconto_avista_percent': desconto_percent,
@@ -133,6 +186,22 @@ def calcular_eps(area_m2: float, produto_id: int = 1) -> dict:
         'isolamento': produto['isolamento'],
         'aplicacao': produto['aplicacao']
     }
+    if referencia:
+        resultado['preco_referencia'] = referencia
+
+    return resultado
+
+
+# Descritor usado pelo registro de módulos da API
+MODULO = {
+    'descricao': 'Placas de EPS para isolamento térmico',
+    'dados_path': DADOS_PATH,
+    'carregar': carregar_eps,
+    'chave_itens': 'produtos',
+    'calcular': calcular_eps,
+    'parametros': {'area': 'area'},
+    'parametro_id': 'produto_id'
+}
 
 
 # Teste rápido
@@ -0,0 +1,131 @@
+# Busca de Fornecedores, Produtos e Preços
+# Índices de busca textual para o cadastro, o histórico e os catálogos dos
+# módulos. Cada arquivo de dados tem o seu próprio índice, guardado pelo
+# cache de arquivos como estrutura derivada; a busca consulta todos juntos.
+
+from shared.utils.busca import criar_indice, indexar_documento, remover_documento
+
+
+# ============ FORNECEDORES ============
+
+def indexar_fornecedor(indice: dict, fornecedor: dict) -> None:
+    """
+    Indexa um fornecedor (nome, contato, categorias, endereço).
+
+    Fornecedores desativados saem da busca, como em listar_fornecedores().
+    """
+    if not fornecedor.get('ativo', True):
+        remover_documento(indice, f"fornecedor:{fornecedor['id']}")
+        return
+
+    indexar_documento(
+        indice,
+        f"fornecedor:{fornecedor['id']}",
+        'fornecedor',
+        fornecedor.get('nome'),
+        [
+            (fornecedor.get('nome'), 3),
+            (fornecedor.get('contato'), 2),
+            (' '.join(fornecedor.get('categorias', [])), 2),
+            (fornecedor.get('endereco'), 1)
+        ],
+        fornecedor
+    )
+
+
+def indexar_fornecedores(fornecedores: list) -> dict:
+    """Monta o índice do cadastro de fornecedores (só os ativos)"""
+    indice = criar_indice()
+    for fornecedor in fornecedores:
+        indexar_fornecedor(indice, fornecedor)
+    return indice
+
+
+# ============ HISTÓRICO DE PREÇOS ============
+
+def indexar_registro(indice: dict, registro: dict) -> None:
+    """Indexa um registro de preços (produtos, categoria e observação)"""
+    nomes = ' '.join(p.get('nome') or '' for p in registro['produtos'])
+    indexar_documento(
+        indice,
+        f"registro:{registro['id']}",
+        'registro',
+        f"{registro['data']} - {registro['categoria']}",
+        [
+            (nomes, 2),
+            (registro['categoria'], 2),
+            (registro.get('observacao'), 1)
+        ],
+        registro
+    )
+
+
+def indexar_historico(historico: list) -> dict:
+    """Monta o índice do histórico de preços"""
+    indice = criar_indice()
+    for registro in historico:
+        indexar_registro(indice, registro)
+    return indice
+
+
+# ============ CATÁLOGOS ============
+
+def indexar_catalogo(categoria: str, itens: list) -> dict:
+    """
+    Monta o índice dos produtos do catálogo de um módulo.
+
+    Args:
+        categoria: nome do módulo (blocos, eps, ...)
+        itens: produtos do catálogo (com id, nome e aplicacao)
+
+    Returns:
+        Índice com um documento por produto
+    """
+    indice = criar_indice()
+    for item in itens:
+        indexar_documento(
+            indice,
+            f"produto:{categoria}:{item['id']}",
+            'produto',
+            item.get('nome'),
+            [
+                (item.get('nome'), 3),
+                (categoria, 2),
+                (item.get('aplicacao'), 1)
+            ],
+            dict(item, categoria=categoria)
+        )
+    return indice
+
+
+# Teste rápido (cd src && python -m shared.fornecedores.busca)
+if __name__ == "__main__":
+    from shared.utils.busca import buscar
+
+    fornecedores = indexar_fornecedores([
+        {'id': 1, 'nome': 'Isoportal', 'contato': 'Victor', 'categorias': ['eps'], 'ativo': True},
+        {'id': 2, 'nome': 'Isopor Antigo', 'categorias': ['eps'], 'ativo': False}
+    ])
+    historico = indexar_historico([
+        {'id': 7, 'data': '2025-02-01', 'categoria': 'eps', 'observacao': 'Promoção de março',
+         'produtos': [{'produto_id': 1, 'nome': 'EPS 30mm', 'preco': 7.5}]}
+    ])
+    catalogo = indexar_catalogo('eps', [{'id': 1, 'nome': 'EPS 30mm', 'aplicacao': 'Forro e paredes'}])
+    indices = [fornecedores, historico, catalogo]
+
+    # Fornecedor desativado fica fora da busca
+    resultado = buscar(indices, 'isopor')
+    print([(r['id'], r['score']) for r in resultado['resultados']])
+    assert 'fornecedor:2' not in [r['id'] for r in resultado['resultados']]
+
+    # Desativar pela gravação (acumular) remove o documento do índice
+    indexar_fornecedor(fornecedores, {'id': 1, 'nome': 'Isoportal', 'ativo': False})
+    assert buscar(indices, 'isoportal', tipo='fornecedor')['total'] == 0
+
+    # Cada arquivo tem o seu índice: reconstruir um não mexe nos outros
+    resultado = buscar(indices, 'eps 30mm')
+    print([(r['id'], r['score']) for r in resultado['resultados']])
+    assert {r['id'] for r in resultado['resultados']} == {'registro:7', 'produto:eps:1'}
+    catalogo = indexar_catalogo('eps', [])
+    assert [r['id'] for r in buscar([fornecedores, historico, catalogo], 'eps 30mm')['resultados']] == ['registro:7']
+    assert buscar([historico], 'promocao marco')['resultados'][0]['dados']['id'] == 7
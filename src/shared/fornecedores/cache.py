@@ -0,0 +1,175 @@
+# Cache dos Arquivos de Dados
+# Cada arquivo JSON é lido uma vez por modificação e alimenta as estruturas
+# derivadas dele (estatísticas, índice por data, busca). Gravações feitas
+# pelo gerenciador atualizam as estruturas sem reler o arquivo; mudanças
+# feitas por fora (edição manual, outro worker) são detectadas pelo mtime.
+
+import os
+
+# caminho -> {'carregar', 'mtime', 'dados', 'derivados', 'construtores'}
+_arquivos = {}
+
+
+def registrar_arquivo(caminho: str, carregar) -> None:
+    """
+    Registra um arquivo de dados no cache.
+
+    Args:
+        caminho: caminho do arquivo JSON
+        carregar: função que lê o arquivo e retorna os dados usados
+                  pelas estruturas derivadas (ex: a lista de registros)
+    """
+    if caminho not in _arquivos:
+        _arquivos[caminho] = {
+            'carregar': carregar,
+            'mtime': None,
+            'dados': None,
+            'derivados': {},
+            'construtores': {}
+        }
+
+
+def registrar_derivado(caminho: str, nome: str, construir, acumular) -> None:
+    """
+    Registra uma estrutura derivada de um arquivo.
+
+    Args:
+        caminho: arquivo já registrado com registrar_arquivo
+        nome: nome da estrutura (ex: 'estatisticas')
+        construir: função(dados) -> estrutura, a partir dos dados completos
+        acumular: função(estrutura, item) que aplica um item recém gravado
+    """
+    _arquivos[caminho]['construtores'][nome] = (construir, acumular)
+
+
+def _mtime(caminho: str) -> int:
+    """Data de modificação (ns) de um arquivo"""
+    return os.stat(caminho).st_mtime_ns
+
+
+def _invalidar(arquivo: dict) -> None:
+    """Descarta os dados e as estruturas derivadas de um arquivo"""
+    arquivo['mtime'] = None
+    arquivo['dados'] = None
+    arquivo['derivados'] = {}
+
+
+def obter_derivado(caminho: str, nome: str):
+    """
+    Retorna uma estrutura derivada, reconstruindo se o arquivo mudou.
+
+    O arquivo é lido no máximo uma vez por modificação, mesmo que várias
+    estruturas precisem ser reconstruídas.
+    """
+    arquivo = _arquivos[caminho]
+    mtime = _mtime(caminho)
+    if arquivo['mtime'] != mtime:
+        _invalidar(arquivo)
+        arquivo['mtime'] = mtime
+
+    if nome not in arquivo['derivados']:
+        if arquivo['dados'] is None:
+            arquivo['dados'] = arquivo['carregar']()
+        construir, _ = arquivo['construtores'][nome]
+        arquivo['derivados'][nome] = construir(arquivo['dados'])
+
+    return arquivo['derivados'][nome]
+
+
+def mtime_antes_de_gravar(caminho: str) -> int:
+    """mtime do arquivo antes de uma gravação (para registrar_gravacao)"""
+    return _mtime(caminho)
+
+
+def registrar_gravacao(caminho: str, item, dados, mtime_anterior: int) -> None:
+    """
+    Aplica um item recém gravado às estruturas derivadas do arquivo.
+
+    Se o cache não estava sincronizado com o arquivo antes da gravação,
+    tudo é descartado e reconstruído na próxima consulta.
+
+    Args:
+        caminho: arquivo gravado
+        item: item novo ou alterado (registro, fornecedor)
+        dados: dados completos já gravados (mesmo formato de carregar())
+        mtime_anterior: mtime do arquivo antes da gravação
+    """
+    arquivo = _arquivos.get(caminho)
+    if arquivo is None:
+        return
+
+    if arquivo['mtime'] != mtime_anterior:
+        _invalidar(arquivo)
+        return
+
+    for nome, estrutura in arquivo['derivados'].items():
+        _, acumular = arquivo['construtores'][nome]
+        acumular(estrutura, item)
+    arquivo['dados'] = dados
+    arquivo['mtime'] = _mtime(caminho)
+
+
+# Teste rápido (cd src && python -m shared.fornecedores.cache)
+if __name__ == "__main__":
+    import json
+    import tempfile
+
+    caminho = os.path.join(tempfile.mkdtemp(), 'itens.json')
+    leituras = []
+
+    def salvar(itens: list, mtime_ns: int) -> None:
+        with open(caminho, 'w') as f:
+            json.dump(itens, f)
+        os.utime(caminho, ns=(mtime_ns, mtime_ns))
+
+    def carregar() -> list:
+        leituras.append(caminho)
+        with open(caminho) as f:
+            return json.load(f)
+
+    def construir_soma(itens: list) -> dict:
+        return {'total': sum(itens)}
+
+    def acumular_soma(soma: dict, item: int) -> None:
+        soma['total'] += item
+
+    def construir_maior(itens: list) -> dict:
+        return {'maior': max(itens)}
+
+    def acumular_maior(maior: dict, item: int) -> None:
+        maior['maior'] = max(maior['maior'], item)
+
+    salvar([1, 2, 3], 1_000_000_000)
+    registrar_arquivo(caminho, carregar)
+    registrar_derivado(caminho, 'soma', construir_soma, acumular_soma)
+    registrar_derivado(caminho, 'maior', construir_maior, acumular_maior)
+
+    # Duas estruturas do mesmo arquivo: uma leitura só
+    print(obter_derivado(caminho, 'soma'), obter_derivado(caminho, 'maior'), f"{len(leituras)} leitura(s)")
+    assert len(leituras) == 1
+
+    # Gravação registrada: as estruturas acumulam o item sem reler o arquivo
+    mtime_anterior = mtime_antes_de_gravar(caminho)
+    salvar([1, 2, 3, 10], 2_000_000_000)
+    registrar_gravacao(caminho, 10, [1, 2, 3, 10], mtime_anterior)
+    print(obter_derivado(caminho, 'soma'), obter_derivado(caminho, 'maior'), f"{len(leituras)} leitura(s)")
+    assert obter_derivado(caminho, 'soma')['total'] == 16
+    assert obter_derivado(caminho, 'maior')['maior'] == 10
+    assert len(leituras) == 1
+
+    # Edição por fora (mtime mudou): reconstrói tudo com uma nova leitura
+    salvar([5], 3_000_000_000)
+    print(obter_derivado(caminho, 'soma'), obter_derivado(caminho, 'maior'), f"{len(leituras)} leitura(s)")
+    assert obter_derivado(caminho, 'soma')['total'] == 5
+    assert obter_derivado(caminho, 'maior')['maior'] == 5
+    assert len(leituras) == 2
+
+    # Gravação com o cache defasado (outro worker gravou antes): descarta e relê
+    salvar([5, 7], 4_000_000_000)
+    mtime_anterior = mtime_antes_de_gravar(caminho)
+    salvar([5, 7, 1], 5_000_000_000)
+    registrar_gravacao(caminho, 1, [5, 7, 1], mtime_anterior)
+    print(obter_derivado(caminho, 'soma'), obter_derivado(caminho, 'maior'), f"{len(leituras)} leitura(s)")
+    assert obter_derivado(caminho, 'soma')['total'] == 13
+    assert obter_derivado(caminho, 'maior')['maior'] == 7
+    assert len(leituras) == 3
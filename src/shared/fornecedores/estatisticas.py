@@ -0,0 +1,275 @@
+# Estatísticas de Preços
+# Agregados mensais (min, max, média, último) por produto e fornecedor
+# mantidos de forma incremental a partir do histórico de preços
+
+from datetime import datetime
+from typing import Optional
+
+from shared.utils.datas import normalizar_data
+
+
+def _chave_serie(categoria: str, produto_id: int, fornecedor_id: int) -> str:
+    """Monta a chave de uma série (categoria + produto + fornecedor)"""
+    return f"{categoria}_{produto_id}_{fornecedor_id}"
+
+
+def _acumular_preco(mes: dict, data: str, preco: float) -> None:
+    """Acumula um preço observado no agregado de um mês"""
+    if mes['n'] == 0:
+        mes['min'] = preco
+        mes['max'] = preco
+    else:
+        mes['min'] = min(mes['min'], preco)
+        mes['max'] = max(mes['max'], preco)
+
+    mes['soma'] += preco
+    mes['n'] += 1
+
+    # Primeiro e último preço do mês pela data do registro
+    if mes['primeira_data'] is None or data < mes['primeira_data']:
+        mes['primeira_data'] = data
+        mes['primeiro'] = preco
+    if mes['ultima_data'] is None or data >= mes['ultima_data']:
+        mes['ultima_data'] = data
+        mes['ultimo'] = preco
+
+
+def acumular_registro(series: dict, registro: dict) -> None:
+    """
+    Acumula um registro de preços nos agregados mensais.
+
+    Datas fora do formato YYYY-MM-DD são normalizadas antes de achar o mês
+    (senão '2025-2-1' viraria o mês '2025-2-'); registros com data inválida
+    ficam fora dos agregados.
+
+    Args:
+        series: dict de séries (chave -> dados da série)
+        registro: registro do histórico de preços
+    """
+    try:
+        data = normalizar_data(registro.get('data'))
+    except ValueError:
+        data = None
+    if data is None:
+        return
+    mes_ref = data[:7]
+
+    for produto in registro['produtos']:
+        if produto.get('preco') is None:
+            continue
+
+        chave = _chave_serie(registro['categoria'], produto['produto_id'], registro['fornecedor_id'])
+        serie = series.get(chave)
+        if serie is None:
+            serie = {
+                'categoria': registro['categoria'],
+                'produto_id': produto['produto_id'],
+                'fornecedor_id': registro['fornecedor_id'],
+                'nome': produto.get('nome'),
+                'ultima_data': data,
+                'meses': {}
+            }
+            series[chave] = serie
+
+        mes = serie['meses'].get(mes_ref)
+        if mes is None:
+            mes = {
+                'min': None,
+                'max': None,
+                'soma': 0.0,
+                'n': 0,
+                'primeiro': None,
+                'primeira_data': None,
+                'ultimo': None,
+                'ultima_data': None
+            }
+            serie['meses'][mes_ref] = mes
+
+        _acumular_preco(mes, data, produto['preco'])
+
+        # Mantém o nome do registro mais recente da série
+        if data >= serie['ultima_data']:
+            serie['ultima_data'] = data
+            if produto.get('nome'):
+                serie['nome'] = produto['nome']
+
+
+def construir_estatisticas(historico: list) -> dict:
+    """
+    Monta os agregados mensais a partir do histórico completo.
+
+    Args:
+        historico: lista de registros de preços
+
+    Returns:
+        Dict de séries (chave -> dados da série)
+    """
+    series = {}
+    for registro in historico:
+        acumular_registro(series, registro)
+    return series
+
+
+def _variacao_percent(anterior: Optional[float], atual: Optional[float]) -> Optional[float]:
+    """Variação percentual entre dois preços"""
+    if anterior is None or atual is None or anterior == 0:
+        return None
+    return round((atual - anterior) / anterior * 100, 2)
+
+
+def _normalizar_mes(valor: Optional[str]) -> Optional[str]:
+    """Aceita YYYY-MM ou YYYY-MM-DD e retorna YYYY-MM (ValueError se inválido)"""
+    if not valor:
+        return None
+    try:
+        return datetime.strptime(valor, '%Y-%m').strftime('%Y-%m')
+    except ValueError:
+        pass
+    try:
+        return normalizar_data(valor)[:7]
+    except ValueError:
+        raise ValueError(f"Mês '{valor}' inválido. Use YYYY-MM (ex: 2025-01)")
+
+
+def _mes_inicial(meses: int) -> str:
+    """Mês (YYYY-MM) de início de uma janela dos últimos N meses"""
+    hoje = datetime.now()
+    total = hoje.year * 12 + (hoje.month - 1) - (meses - 1)
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+
+def consultar_estatisticas(
+    series: dict,
+    categoria: str = None,
+    produto_id: int = None,
+    fornecedor_id: int = None,
+    desde: str = None,
+    ate: str = None,
+    meses: int = None
+) -> list:
+    """
+    Consulta os agregados mensais de preço.
+
+    Args:
+        series: dict de séries (ver construir_estatisticas)
+        categoria: filtra por categoria (opcional)
+        produto_id: filtra por produto (opcional)
+        fornecedor_id: filtra por fornecedor (opcional)
+        desde: mês inicial YYYY-MM (opcional)
+        ate: mês final YYYY-MM (opcional)
+        meses: janela dos últimos N meses, ignora 'desde' (opcional)
+
+    Returns:
+        Lista de séries com os meses e um resumo do período, ordenada por
+        categoria, produto e preço médio (fornecedor mais barato primeiro)
+    """
+    desde = _mes_inicial(meses) if meses else _normalizar_mes(desde)
+    ate = _normalizar_mes(ate)
+
+    resultado = []
+    for serie in series.values():
+        if categoria and serie['categoria'] != categoria:
+            continue
+        if produto_id and serie['produto_id'] != produto_id:
+            continue
+        if fornecedor_id and serie['fornecedor_id'] != fornecedor_id:
+            continue
+
+        meses_serie = []
+        ultimo_anterior = None
+        for mes_ref in sorted(serie['meses']):
+            mes = serie['meses'][mes_ref]
+            variacao = _variacao_percent(ultimo_anterior, mes['ultimo'])
+            ultimo_anterior = mes['ultimo']
+
+            if desde and mes_ref < desde:
+                continue
+            if ate and mes_ref > ate:
+                continue
+
+            meses_serie.append({
+                'mes': mes_ref,
+                'min': mes['min'],
+                'max': mes['max'],
+                'media': round(mes['soma'] / mes['n'], 2),
+                'primeiro': mes['primeiro'],
+                'ultimo': mes['ultimo'],
+                'observacoes': mes['n'],
+                'variacao_percent': variacao
+            })
+
+        if not meses_serie:
+            continue
+
+        soma = sum(serie['meses'][m['mes']]['soma'] for m in meses_serie)
+        n = sum(m['observacoes'] for m in meses_serie)
+        primeiro = meses_serie[0]['primeiro']
+        ultimo = meses_serie[-1]['ultimo']
+
+        resultado.append({
+            'categoria': serie['categoria'],
+            'produto_id': serie['produto_id'],
+            'fornecedor_id': serie['fornecedor_id'],
+            'nome': serie['nome'],
+            'meses': meses_serie,
+            'resumo': {
+                'desde': meses_serie[0]['mes'],
+                'ate': meses_serie[-1]['mes'],
+                'min': min(m['min'] for m in meses_serie),
+                'max': max(m['max'] for m in meses_serie),
+                'media': round(soma / n, 2),
+                'primeiro': primeiro,
+                'ultimo': ultimo,
+                'observacoes': n,
+                'variacao_percent': _variacao_percent(primeiro, ultimo)
+            }
+        })
+
+    resultado.sort(key=lambda s: (s['categoria'], s['produto_id'], s['resumo']['media']))
+    return resultado
+
+
+# Teste rápido (cd src && python -m shared.fornecedores.estatisticas)
+if __name__ == "__main__":
+    def registro(data: str, preco: float, nome: str = 'EPS 30mm') -> dict:
+        return {
+            'data': data,
+            'fornecedor_id': 1,
+            'categoria': 'eps',
+            'produtos': [{'produto_id': 1, 'nome': nome, 'preco': preco}]
+        }
+
+    series = construir_estatisticas([
+        registro('2025-01-10', 100.0),
+        registro('2025-02-01', 104.0),
+        registro('2025-02-20', 110.0, 'EPS 30mm (novo)'),
+        registro('2025-3-5', 121.0, 'EPS 30mm Plus'),  # sem zeros: mês 2025-03
+        registro('lixo', 1.0),                         # data inválida: ignorado
+        registro('2025-01-20', 90.0, 'EPS 30mm (antigo)')  # gravado depois, data anterior
+    ])
+
+    serie = consultar_estatisticas(series)[0]
+    for mes in serie['meses']:
+        print(mes['mes'], mes['min'], mes['max'], mes['ultimo'], mes['variacao_percent'])
+    print(serie['nome'], serie['resumo'])
+
+    assert [m['mes'] for m in serie['meses']] == ['2025-01', '2025-02', '2025-03']
+    assert serie['meses'][0]['ultimo'] == 90.0        # último pela data, não pela ordem gravada
+    assert serie['meses'][1]['variacao_percent'] == 22.22
+    assert serie['meses'][2]['variacao_percent'] == 10.0
+    assert serie['resumo']['ultimo'] == 121.0
+    assert serie['resumo']['observacoes'] == 5
+    assert serie['nome'] == 'EPS 30mm Plus'            # nome do registro mais recente
+
+    # Filtro por período: a variação do primeiro mês ainda usa o mês anterior
+    filtrada = consultar_estatisticas(series, desde='2025-2')[0]
+    assert [m['mes'] for m in filtrada['meses']] == ['2025-02', '2025-03']
+    assert filtrada['meses'][0]['variacao_percent'] == 22.22
+    assert filtrada['resumo']['variacao_percent'] == 16.35  # 104 -> 121
+
+    try:
+        consultar_estatisticas(series, desde='2025-13')
+    except ValueError as e:
+        print(e)
+    else:
+        raise AssertionError("mês inválido deveria ser rejeitado")
@@ -6,6 +6,12 @@ import os
 from datetime import datetime
 from typing import Optional
 
+from shared.fornecedores import busca, cache
+from shared.fornecedores.estatisticas import construir_estatisticas, acumular_registro, consultar_estatisticas
+from shared.fornecedores.indice import construir_indice, indexar_registro, registro_vigente, produto_vigente
+from shared.utils.busca import buscar
+from shared.utils.datas import normalizar_data
+
 # Caminhos dos arquivos de dados
 DADOS_PATH = os.path.join(os.path.dirname(__file__), 'dados')
 FORNECEDORES_PATH = os.path.join(DADOS_PATH, 'fornecedores.json')
@@ -85,7 +91,9 @@ def adicionar_fornecedor(dados_fornecedor: dict) -> dict:
     }
 
     dados['fornecedores'].append(novo_fornecedor)
+    mtime_anterior = cache.mtime_antes_de_gravar(FORNECEDORES_PATH)
     salvar_fornecedores(dados)
+    cache.registrar_gravacao(FORNECEDORES_PATH, novo_fornecedor, dados['fornecedores'], mtime_anterior)
 
     return novo_fornecedor
 
@@ -110,7 +118,9 @@ def atualizar_fornecedor(fornecedor_id: int, dados_atualizados: dict) -> Optiona
                 if chave != 'id':  # Não permite alterar ID
                     dados['fornecedores'][i][chave] = valor
 
+            mtime_anterior = cache.mtime_antes_de_gravar(FORNECEDORES_PATH)
             salvar_fornecedores(dados)
+            cache.registrar_gravacao(FORNECEDORES_PATH, dados['fornecedores'][i], dados['fornecedores'], mtime_anterior)
             return dados['fornecedores'][i]
 
     return None
@@ -136,34 +146,71 @@ def salvar_historico_precos(dados: dict) -> None:
         json.dump(dados, f, ensure_ascii=False, indent=2)
 
 
-def buscar_precos_atuais(fornecedor_id: int = None, categoria: str = None) -> list:
+def buscar_precos_atuais(fornecedor_id: int = None, categoria: str = None, as_of: str = None) -> list:
     """
-    Busca os preços mais recentes.
+    Busca os preços mais recentes (ou os vigentes em uma data).
 
     Args:
         fornecedor_id: filtra por fornecedor (opcional)
         categoria: filtra por categoria (opcional)
+        as_of: data YYYY-MM-DD; retorna os preços em vigor nesse dia
+               (opcional, ValueError se inválida)
 
     Returns:
-        Lista com os registros de preços mais recentes
+        Lista com um registro de preços por fornecedor+categoria
     """
-    dados = carregar_historico_precos()
-    historico = dados['historico']
+    as_of = normalizar_data(as_of)
+    indice = cache.obter_derivado(PRECOS_PATH, 'indice')
+
+    vigentes = []
+    for (id_fornecedor, id_categoria), entrada in indice.items():
+        if fornecedor_id and id_fornecedor != fornecedor_id:
+            continue
+        if categoria and id_categoria != categoria:
+            continue
 
-    # Filtra
-    if fornecedor_id:
-        historico = [h for h in historico if h['fornecedor_id'] == fornecedor_id]
-    if categoria:
-        historico = [h for h in historico if h['categoria'] == categoria]
+        registro = registro_vigente(entrada, as_of)
+        if registro is not None:
+            vigentes.append(registro)
 
-    # Agrupa por fornecedor+categoria e pega o mais recente
-    mais_recentes = {}
-    for registro in historico:
-        chave = f"{registro['fornecedor_id']}_{registro['categoria']}"
-        if chave not in mais_recentes or registro['data'] > mais_recentes[chave]['data']:
-            mais_recentes[chave] = registro
+    return vigentes
 
-    return list(mais_recentes.values())
+
+def buscar_preco_produto(categoria: str, produto_id: int, fornecedor_id: int = None, as_of: str = None) -> Optional[dict]:
+    """
+    Busca o preço de um produto em vigor em uma data.
+
+    Sem fornecedor, usa o preço vigente mais recente entre os fornecedores
+    que têm o produto.
+
+    Args:
+        categoria: categoria do produto
+        produto_id: ID do produto
+        fornecedor_id: fornecedor (opcional)
+        as_of: data YYYY-MM-DD (None = mais recente, ValueError se inválida)
+
+    Returns:
+        {produto, registro} ou None se não havia preço na data
+    """
+    as_of = normalizar_data(as_of)
+    indice = cache.obter_derivado(PRECOS_PATH, 'indice')
+
+    encontrado = None
+    for (id_fornecedor, id_categoria), entrada in indice.items():
+        if id_categoria != categoria:
+            continue
+        if fornecedor_id and id_fornecedor != fornecedor_id:
+            continue
+
+        vigente = produto_vigente(entrada, produto_id, as_of)
+        if vigente is None:
+            continue
+
+        produto, registro = vigente
+        if encontrado is None or registro['data'] > encontrado['registro']['data']:
+            encontrado = {'produto': produto, 'registro': registro}
+
+    return encontrado
 
 
 def adicionar_registro_precos(
@@ -182,7 +229,7 @@ def adicionar_registro_precos(
         fornecedor_id: ID do fornecedor
         categoria: categoria dos produtos (blocos, eps, etc)
         produtos: lista de produtos com preços
-        data: data do registro (YYYY-MM-DD), default hoje
+        data: data do registro (YYYY-MM-DD), default hoje; ValueError se inválida
         observacao: observação opcional
         frete: tabela de frete opcional
         desconto_avista_percent: desconto à vista opcional
@@ -196,8 +243,11 @@ def adicionar_registro_precos(
     max_id = max([h['id'] for h in dados['historico']], default=0)
     novo_id = max_id + 1
 
-    # Data default = hoje
-    if not data:
+    # Data default = hoje; o índice por data e os agregados comparam as
+    # datas como texto, então só grava no formato YYYY-MM-DD
+    if data:
+        data = normalizar_data(data)
+    else:
         data = datetime.now().strftime('%Y-%m-%d')
 
     novo_registro = {
@@ -216,8 +266,12 @@ def adicionar_registro_precos(
         novo_registro['desconto_avista_percent'] = desconto_avista_percent
 
     dados['historico'].append(novo_registro)
+    mtime_anterior = cache.mtime_antes_de_gravar(PRECOS_PATH)
     salvar_historico_precos(dados)
 
+    # Atualiza estatísticas, índice por data e busca sem reprocessar o histórico
+    cache.registrar_gravacao(PRECOS_PATH, novo_registro, dados['historico'], mtime_anterior)
+
     return novo_registro
 
 
@@ -261,6 +315,93 @@ def listar_historico_completo() -> list:
     return historico
 
 
+def estatisticas_precos(
+    categoria: str = None,
+    produto_id: int = None,
+    fornecedor_id: int = None,
+    desde: str = None,
+    ate: str = None,
+    meses: int = None
+) -> list:
+    """
+    Retorna os agregados mensais de preço (min, max, média, último, variação).
+
+    Args:
+        categoria: filtra por categoria (opcional)
+        produto_id: filtra por produto (opcional)
+        fornecedor_id: filtra por fornecedor (opcional)
+        desde: mês inicial YYYY-MM (opcional)
+        ate: mês final YYYY-MM (opcional)
+        meses: janela dos últimos N meses (opcional)
+
+    Returns:
+        Lista de séries por (categoria, produto, fornecedor) com resumo do período
+    """
+    series = cache.obter_derivado(PRECOS_PATH, 'estatisticas')
+    return consultar_estatisticas(series, categoria, produto_id, fornecedor_id, desde, ate, meses)
+
+
+# ============ CACHE ============
+
+# Estruturas derivadas dos arquivos, atualizadas a cada gravação
+cache.registrar_arquivo(FORNECEDORES_PATH, lambda: carregar_fornecedores()['fornecedores'])
+cache.registrar_derivado(FORNECEDORES_PATH, 'busca', busca.indexar_fornecedores, busca.indexar_fornecedor)
+
+cache.registrar_arquivo(PRECOS_PATH, lambda: carregar_historico_precos()['historico'])
+cache.registrar_derivado(PRECOS_PATH, 'estatisticas', construir_estatisticas, acumular_registro)
+cache.registrar_derivado(PRECOS_PATH, 'indice', construir_indice, indexar_registro)
+cache.registrar_derivado(PRECOS_PATH, 'busca', busca.indexar_historico, busca.indexar_registro)
+
+
+# ============ BUSCA ============
+
+# Catálogos dos módulos incluídos na busca (ver registrar_catalogo_produtos)
+_catalogos = []
+
+
+def buscar_texto(consulta: str, tipo: str = None, pagina: int = 1, por_pagina: int = 20) -> dict:
+    """
+    Busca textual em fornecedores, registros de preços e produtos de catálogo.
+
+    Ignora acentos e maiúsculas ("concreto" encontra "Concreto", "sao" encontra "São")
+    e tolera palavras incompletas ou com pequenos erros.
+
+    Args:
+        consulta: texto buscado
+        tipo: 'fornecedor', 'registro' ou 'produto' (opcional)
+        pagina: página dos resultados (começa em 1)
+        por_pagina: resultados por página
+
+    Returns:
+        Dict com total, pagina, por_pagina e resultados ordenados por relevância
+    """
+    # Um índice por arquivo (fornecedores, histórico, catálogos), cada um
+    # reconstruído só quando o seu arquivo muda
+    arquivos = [FORNECEDORES_PATH, PRECOS_PATH] + _catalogos
+    indices = [cache.obter_derivado(caminho, 'busca') for caminho in arquivos]
+    return buscar(indices, consulta, tipo, pagina, por_pagina)
+
+
+def registrar_catalogo_produtos(categoria: str, dados_path: str, carregar_itens) -> None:
+    """
+    Inclui os produtos do catálogo de um módulo na busca textual.
+
+    O catálogo é lido na primeira busca e de novo só quando o arquivo muda.
+
+    Args:
+        categoria: nome do módulo (blocos, eps, ...)
+        dados_path: arquivo JSON do catálogo
+        carregar_itens: função que retorna a lista de produtos do catálogo
+    """
+    if dados_path in _catalogos:
+        return
+
+    # Catálogos não são gravados pela API, então não há o que acumular
+    cache.registrar_arquivo(dados_path, carregar_itens)
+    cache.registrar_derivado(dados_path, 'busca', lambda itens: busca.indexar_catalogo(categoria, itens), None)
+    _catalogos.append(dados_path)
+
+
 # ============ TESTE ============
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+# Índice de Preços por Data
+# Registros ordenados por data para cada (fornecedor, categoria), permitindo
+# achar por busca binária o registro vigente em uma data
+
+from bisect import bisect_right
+from typing import Optional
+
+from shared.utils.datas import normalizar_data
+
+
+def indexar_registro(indice: dict, registro: dict) -> None:
+    """
+    Insere um registro no índice mantendo a ordem por data.
+
+    Registros com a mesma data ficam na ordem em que foram gravados. Datas
+    fora do formato YYYY-MM-DD (editadas à mão no JSON) são normalizadas;
+    registros com data inválida ficam fora do índice.
+
+    Args:
+        indice: dict (fornecedor_id, categoria) -> {'datas': [...], 'registros': [...]}
+        registro: registro do histórico de preços
+    """
+    try:
+        data = normalizar_data(registro.get('data'))
+    except ValueError:
+        data = None
+    if data is None:
+        return
+    if data != registro['data']:
+        registro = dict(registro, data=data)
+
+    chave = (registro['fornecedor_id'], registro['categoria'])
+    entrada = indice.get(chave)
+    if entrada is None:
+        entrada = {'datas': [], 'registros': []}
+        indice[chave] = entrada
+
+    posicao = bisect_right(entrada['datas'], registro['data'])
+    entrada['datas'].insert(posicao, registro['data'])
+    entrada['registros'].insert(posicao, registro)
+
+
+def construir_indice(historico: list) -> dict:
+    """Monta o índice a partir do histórico completo"""
+    indice = {}
+    for registro in historico:
+        indexar_registro(indice, registro)
+    return indice
+
+
+def _posicao_vigente(entrada: dict, as_of: str = None) -> int:
+    """
+    Posição do registro em vigor em uma data (o mais recente com data <= as_of).
+
+    Entre registros da mesma data vale o último gravado (a correção mais
+    recente). Retorna -1 se não havia registro na data.
+    """
+    if as_of is None:
+        return len(entrada['datas']) - 1
+    return bisect_right(entrada['datas'], as_of) - 1
+
+
+def registro_vigente(entrada: dict, as_of: str = None) -> Optional[dict]:
+    """
+    Registro em vigor em uma data.
+
+    Args:
+        entrada: entrada do índice de um (fornecedor, categoria)
+        as_of: data YYYY-MM-DD (None = mais recente)
+
+    Returns:
+        Registro vigente ou None se não havia preço na data
+    """
+    posicao = _posicao_vigente(entrada, as_of)
+    if posicao < 0:
+        return None
+    return entrada['registros'][posicao]
+
+
+def produto_vigente(entrada: dict, produto_id: int, as_of: str = None) -> Optional[tuple]:
+    """
+    Preço de um produto em vigor em uma data.
+
+    Se o registro vigente não traz o produto (atualização parcial), volta
+    aos registros anteriores (primeiro os da mesma data, depois os mais
+    antigos) até achar o último preço informado.
+
+    Args:
+        entrada: entrada do índice de um (fornecedor, categoria)
+        produto_id: ID do produto
+        as_of: data YYYY-MM-DD (None = mais recente)
+
+    Returns:
+        Tupla (produto, registro) ou None se não havia preço na data
+    """
+    for posicao in range(_posicao_vigente(entrada, as_of), -1, -1):
+        registro = entrada['registros'][posicao]
+        for produto in registro['produtos']:
+            if produto['produto_id'] == produto_id:
+                return produto, registro
+    return None
+
+
+# Teste rápido (cd src && python -m shared.fornecedores.indice)
+if __name__ == "__main__":
+    def registro(id_registro: int, data: str, precos: dict) -> dict:
+        return {
+            'id': id_registro,
+            'data': data,
+            'fornecedor_id': 1,
+            'categoria': 'eps',
+            'produtos': [{'produto_id': p, 'preco': v} for p, v in precos.items()]
+        }
+
+    indice = construir_indice([
+        registro(1, '2025-01-10', {1: 10.0, 2: 20.0}),
+        registro(2, '2025-02-01', {1: 11.0, 2: 21.0}),
+        registro(3, '2025-02-01', {1: 11.5}),          # correção parcial no mesmo dia
+        registro(5, '2025-3-1', {1: 12.0}),            # sem zeros: vale 2025-03-01
+        registro(6, 'lixo', {1: 1.0}),                 # data inválida: fora do índice
+        registro(4, '2025-02-20', {2: 22.0})           # gravado depois, data anterior
+    ])
+    entrada = indice[(1, 'eps')]
+    print(entrada['datas'])
+    assert entrada['datas'] == ['2025-01-10', '2025-02-01', '2025-02-01', '2025-02-20', '2025-03-01']
+
+    def vigente(produto_id: int, as_of: str) -> tuple:
+        produto, reg = produto_vigente(entrada, produto_id, as_of)
+        return produto['preco'], reg['id']
+
+    # Mesma data: vale o último gravado
+    assert registro_vigente(entrada, '2025-02-01')['id'] == 3
+    assert vigente(1, '2025-02-01') == (11.5, 3)
+
+    # Registro parcial: o produto 2 vem do outro registro da mesma data,
+    # não de uma data anterior
+    assert vigente(2, '2025-02-01') == (21.0, 2)
+    assert vigente(2, '2025-02-10') == (21.0, 2)
+    assert vigente(2, '2025-02-28') == (22.0, 4)
+
+    # Volta a datas anteriores quando nenhum registro do dia traz o produto
+    assert vigente(1, '2025-02-28') == (11.5, 3)
+
+    # A data sem zeros foi normalizada e ordena depois de fevereiro
+    assert registro_vigente(entrada, '2025-02-28')['id'] == 4
+    assert registro_vigente(entrada, None)['data'] == '2025-03-01'
+    assert vigente(2, None) == (22.0, 4)
+
+    # Antes do primeiro registro não há preço
+    assert registro_vigente(entrada, '2025-01-09') is None
+    assert produto_vigente(entrada, 1, '2025-01-09') is None
+
+    for as_of in ['2025-01-09', '2025-02-01', '2025-02-10', '2025-02-28', None]:
+        print(as_of, [vigente(p, as_of) if produto_vigente(entrada, p, as_of) else None for p in (1, 2)])
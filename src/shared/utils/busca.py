@@ -0,0 +1,209 @@
+# Busca textual
+# Índice invertido de trigramas, sem distinção de acentos e maiúsculas
+
+import unicodedata
+from functools import lru_cache
+
+
+# Fração mínima dos trigramas da consulta que um documento precisa ter
+LIMIAR_PADRAO = 0.6
+
+# Bônus para documentos que contêm a consulta inteira como trecho
+BONUS_TRECHO = 2.0
+
+
+@lru_cache(maxsize=4096)
+def normalizar(texto: str) -> str:
+    """
+    Normaliza um texto para busca: sem acentos, minúsculo, só letras e números.
+
+    Ex: 'Cimento São João - Açaí' -> 'cimento sao joao acai'
+    """
+    sem_acento = unicodedata.normalize('NFKD', texto)
+    sem_acento = ''.join(c for c in sem_acento if not unicodedata.combining(c))
+    limpo = ''.join(c if c.isalnum() else ' ' for c in sem_acento.lower())
+    return ' '.join(limpo.split())
+
+
+def ngramas(texto_normalizado: str, n: int = 3) -> set:
+    """Trigramas de cada palavra, com espaço nas bordas (' bl', 'blo', ...)"""
+    gramas = set()
+    for palavra in texto_normalizado.split():
+        palavra = f" {palavra} "
+        for i in range(len(palavra) - n + 1):
+            gramas.add(palavra[i:i + n])
+    return gramas
+
+
+def criar_indice() -> dict:
+    """Cria um índice vazio"""
+    return {
+        'postings': {},     # trigrama -> {doc_id: peso}
+        'documentos': {}    # doc_id -> dados do documento
+    }
+
+
+def indexar_documento(indice: dict, doc_id, tipo: str, titulo: str, campos: list, dados=None) -> None:
+    """
+    Adiciona (ou substitui) um documento no índice.
+
+    Args:
+        indice: índice criado por criar_indice()
+        doc_id: identificador único do documento
+        tipo: tipo do documento (usado para filtrar a busca)
+        titulo: texto principal exibido no resultado
+        campos: lista de (texto, peso) a indexar; campos com peso maior
+                pontuam mais (ex: nome 3, observação 1)
+        dados: objeto devolvido nos resultados
+    """
+    remover_documento(indice, doc_id)
+
+    pesos = {}
+    textos = []
+    for texto, peso in campos:
+        if not texto:
+            continue
+        texto = normalizar(str(texto))
+        textos.append(texto)
+        for grama in ngramas(texto):
+            if peso > pesos.get(grama, 0):
+                pesos[grama] = peso
+
+    postings = indice['postings']
+    for grama, peso in pesos.items():
+        postings.setdefault(grama, {})[doc_id] = peso
+
+    indice['documentos'][doc_id] = {
+        'tipo': tipo,
+        'titulo': titulo,
+        'dados': dados,
+        'texto': ' | '.join(textos),
+        'gramas': list(pesos)
+    }
+
+
+def remover_documento(indice: dict, doc_id) -> None:
+    """Remove um documento do índice (se existir)"""
+    documento = indice['documentos'].pop(doc_id, None)
+    if documento is None:
+        return
+
+    postings = indice['postings']
+    for grama in documento['gramas']:
+        docs = postings.get(grama)
+        if docs is None:
+            continue
+        docs.pop(doc_id, None)
+        if not docs:
+            del postings[grama]
+
+
+def buscar(
+    indices: list,
+    consulta: str,
+    tipo: str = None,
+    pagina: int = 1,
+    por_pagina: int = 20,
+    limiar: float = LIMIAR_PADRAO
+) -> dict:
+    """
+    Busca documentos por similaridade de trigramas.
+
+    Os resultados de vários índices (ex: um por arquivo de dados) são
+    ordenados juntos; os doc_id precisam ser únicos entre eles.
+
+    Args:
+        indices: lista de índices criados por criar_indice()
+        consulta: texto buscado (acentos e maiúsculas são ignorados)
+        tipo: filtra por tipo de documento (opcional)
+        pagina: página dos resultados (começa em 1)
+        por_pagina: resultados por página
+        limiar: fração mínima dos trigramas da consulta presentes no documento
+
+    Returns:
+        Dict com total, pagina, por_pagina e resultados ordenados por relevância
+    """
+    consulta_normalizada = normalizar(consulta)
+    gramas = ngramas(consulta_normalizada)
+
+    resultado = {'consulta': consulta, 'total': 0, 'pagina': pagina, 'por_pagina': por_pagina, 'resultados': []}
+    if not gramas:
+        return resultado
+
+    total_gramas = len(gramas)
+    encontrados = []
+    for indice in indices:
+        # Conta os trigramas em comum e soma os pesos por documento
+        acertos = {}
+        pontos = {}
+        for grama in gramas:
+            for doc_id, peso in indice['postings'].get(grama, {}).items():
+                acertos[doc_id] = acertos.get(doc_id, 0) + 1
+                pontos[doc_id] = pontos.get(doc_id, 0) + peso
+
+        for doc_id, quantidade in acertos.items():
+            if quantidade / total_gramas < limiar:
+                continue
+            documento = indice['documentos'][doc_id]
+            if tipo and documento['tipo'] != tipo:
+                continue
+
+            score = pontos[doc_id] / total_gramas
+            if consulta_normalizada in documento['texto']:
+                score += BONUS_TRECHO
+            encontrados.append((round(score, 3), doc_id, documento))
+
+    encontrados.sort(key=lambda e: (-e[0], e[2]['titulo'] or ''))
+
+    inicio = (pagina - 1) * por_pagina
+    resultado['total'] = len(encontrados)
+    resultado['resultados'] = [
+        {
+            'tipo': documento['tipo'],
+            'id': doc_id,
+            'titulo': documento['titulo'],
+            'score': score,
+            'dados': documento['dados']
+        }
+        for score, doc_id, documento in encontrados[inicio:inicio + por_pagina]
+    ]
+    return resultado
+
+
+# Teste rápido
+if __name__ == "__main__":
+    print(normalizar('Cimento São João - Açaí'))
+    assert normalizar('Cimento São João - Açaí') == 'cimento sao joao acai'
+
+    fornecedores = criar_indice()
+    indexar_documento(fornecedores, 'f:1', 'fornecedor', 'Isoportal', [('Isoportal', 3), ('Rua Sao Joao', 1)])
+    indexar_documento(fornecedores, 'f:2', 'fornecedor', 'Casa do Isopor', [('Casa do Isopor', 3)])
+    produtos = criar_indice()
+    indexar_documento(produtos, 'p:1', 'produto', 'EPS 30mm', [('EPS 30mm', 3), ('isopor para forro', 1)])
+
+    # Sem acentos/maiúsculas e tolerante a palavra incompleta
+    resultado = buscar([fornecedores], 'SÃO joão')
+    print([(r['id'], r['score']) for r in resultado['resultados']])
+    assert [r['id'] for r in resultado['resultados']] == ['f:1']
+    assert buscar([fornecedores], 'isoporta')['resultados'][0]['id'] == 'f:1'
+
+    # Limiar: poucos trigramas em comum não entram no resultado
+    assert buscar([fornecedores], 'concreto')['total'] == 0
+    assert buscar([fornecedores], 'isoportal', limiar=1.0)['total'] == 1
+
+    # Ranking entre índices: campo de peso maior pontua mais
+    resultado = buscar([fornecedores, produtos], 'isopor')
+    print([(r['id'], r['score']) for r in resultado['resultados']])
+    assert [r['id'] for r in resultado['resultados']] == ['f:2', 'f:1', 'p:1']
+    assert buscar([fornecedores, produtos], 'isopor', tipo='produto')['total'] == 1
+
+    # Paginação
+    pagina = buscar([fornecedores, produtos], 'isopor', pagina=2, por_pagina=2)
+    assert pagina['total'] == 3 and [r['id'] for r in pagina['resultados']] == ['p:1']
+
+    # Reindexar substitui o documento e remover limpa os trigramas
+    indexar_documento(fornecedores, 'f:2', 'fornecedor', 'Tijolaria', [('Tijolaria', 3)])
+    assert buscar([fornecedores], 'casa do isopor')['total'] == 0
+    remover_documento(fornecedores, 'f:2')
+    assert 'f:2' not in fornecedores['documentos']
+    assert all('f:2' not in docs and docs for docs in fornecedores['postings'].values())
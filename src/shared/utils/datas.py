@@ -0,0 +1,41 @@
+# Datas
+# Validação das datas (YYYY-MM-DD) do histórico de preços e das consultas
+
+from datetime import datetime
+from typing import Optional
+
+
+def normalizar_data(valor: Optional[str]) -> Optional[str]:
+    """
+    Valida uma data e retorna no formato YYYY-MM-DD.
+
+    As datas são comparadas como texto (busca binária, meses dos agregados),
+    então só o formato com zeros à esquerda ordena corretamente.
+
+    Ex: '2025-1-5' -> '2025-01-05'
+
+    Args:
+        valor: data a validar (None ou vazio retorna None)
+
+    Returns:
+        Data normalizada ou None
+    """
+    if not valor:
+        return None
+    try:
+        return datetime.strptime(str(valor), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Data '{valor}' inválida. Use YYYY-MM-DD (ex: 2025-01-05)")
+
+
+if __name__ == "__main__":
+    print(normalizar_data('2025-1-5'), normalizar_data('2025-01-10'), normalizar_data(None))
+    assert normalizar_data('2025-1-5') < normalizar_data('2025-01-10')
+
+    for invalida in ['lixo', '2025-13-01', '2025-02-30', '05/01/2025']:
+        try:
+            normalizar_data(invalida)
+        except ValueError as e:
+            print(e)
+        else:
+            raise AssertionError(f"{invalida} deveria ser rejeitada")
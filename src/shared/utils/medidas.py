@@ -0,0 +1,207 @@
+# Interpretação de medidas com unidade
+# Converte medidas de levantamento ("3,5 m", "280cm", "3.5x2.8 m") para metros/m²
+
+import re
+
+try:
+    from shared.utils.conversores import converter_para_metros
+except ImportError:
+    # Execução direta do arquivo (teste rápido)
+    from conversores import converter_para_metros
+
+
+# Divisores para metros, pré-calculados a partir dos conversores
+# (divide em vez de multiplicar por 0.01 para não acumular erro: 280cm = 2.8m)
+DIVISORES_METROS = {unidade: round(1 / converter_para_metros(1, unidade)) for unidade in ('mm', 'cm', 'm')}
+
+# Divisores para m² (unidades de área = unidades lineares ao quadrado)
+DIVISORES_M2 = {
+    'm2': 1,
+    'm²': 1,
+    'cm2': DIVISORES_METROS['cm'] ** 2,
+    'cm²': DIVISORES_METROS['cm'] ** 2,
+    'mm2': DIVISORES_METROS['mm'] ** 2,
+    'mm²': DIVISORES_METROS['mm'] ** 2,
+}
+
+_NUMERO = r'(\d+(?:[.,]\d+)?)'
+_UNIDADE = r'(mm|cm|m)?'
+
+# "280cm", "3,5 m", "900 mm", "2.8"
+RE_MEDIDA = re.compile(rf'^\s*{_NUMERO}\s*{_UNIDADE}\s*$', re.IGNORECASE)
+
+# "3.5x2.8 m", "350 x 280 cm", "3,5m x 280cm"
+RE_DIMENSOES = re.compile(
+    rf'^\s*{_NUMERO}\s*{_UNIDADE}\s*[x×*]\s*{_NUMERO}\s*{_UNIDADE}\s*$',
+    re.IGNORECASE
+)
+
+# "120", "120 m2", "120m²", "15000 cm2"
+RE_AREA = re.compile(rf'^\s*{_NUMERO}\s*(m2|m²|cm2|cm²|mm2|mm²)?\s*$', re.IGNORECASE)
+
+
+def _numero(texto: str) -> float:
+    """Converte número com vírgula ou ponto decimal"""
+    return float(texto.replace(',', '.'))
+
+
+def _divisor(unidade: str, unidade_padrao: str) -> int:
+    """Divisor para metros de uma unidade capturada (ou da padrão)"""
+    unidade = (unidade or unidade_padrao).lower().strip()
+    if unidade not in DIVISORES_METROS:
+        raise ValueError(f"Unidade '{unidade}' não reconhecida. Use: mm, cm ou m")
+    return DIVISORES_METROS[unidade]
+
+
+def interpretar_medida(valor, unidade_padrao: str = 'm') -> float:
+    """
+    Converte uma medida linear para metros.
+
+    Args:
+        valor: número ou texto com unidade ("280cm", "3,5 m", "900 mm")
+        unidade_padrao: unidade usada quando o valor não informa ('mm', 'cm' ou 'm')
+
+    Returns:
+        Valor em metros
+    """
+    # Caminho rápido para valores já numéricos
+    if isinstance(valor, (int, float)):
+        return valor / _divisor(None, unidade_padrao)
+
+    m = RE_MEDIDA.match(valor)
+    if not m:
+        raise ValueError(f"Medida '{valor}' não reconhecida. Ex: 3,5 m, 280cm, 900 mm")
+
+    return _numero(m.group(1)) / _divisor(m.group(2), unidade_padrao)
+
+
+def interpretar_dimensoes(valor, unidade_padrao: str = 'm') -> tuple:
+    """
+    Converte um par largura x altura para metros.
+
+    A unidade no fim vale para as duas medidas ("350x280 cm"), mas cada
+    medida pode ter a sua ("3,5m x 280cm").
+
+    Args:
+        valor: texto "LxA unidade" ou par (largura, altura)
+        unidade_padrao: unidade usada quando o valor não informa
+
+    Returns:
+        Tupla (largura, altura) em metros
+    """
+    if isinstance(valor, (list, tuple)):
+        if len(valor) != 2:
+            raise ValueError(f"Dimensões {list(valor)} não reconhecidas. Use um par [largura, altura]")
+        largura, altura = valor
+        return interpretar_medida(largura, unidade_padrao), interpretar_medida(altura, unidade_padrao)
+
+    m = RE_DIMENSOES.match(valor) if isinstance(valor, str) else None
+    if not m:
+        raise ValueError(f"Dimensões '{valor}' não reconhecidas. Ex: 3.5x2.8 m, 350 x 280 cm")
+
+    largura, unidade_largura, altura, unidade_altura = m.groups()
+    unidade_largura = unidade_largura or unidade_altura
+
+    return (
+        _numero(largura) / _divisor(unidade_largura, unidade_padrao),
+        _numero(altura) / _divisor(unidade_altura, unidade_padrao)
+    )
+
+
+def interpretar_area(valor) -> float:
+    """
+    Converte uma área para m².
+
+    Args:
+        valor: número (m²), texto com unidade ("120 m2", "15000 cm²")
+               ou dimensões ("10x12 m")
+
+    Returns:
+        Área em m²
+    """
+    if isinstance(valor, (int, float)):
+        return valor
+
+    m = RE_AREA.match(valor)
+    if m:
+        unidade = (m.group(2) or 'm2').lower()
+        return _numero(m.group(1)) / DIVISORES_M2[unidade]
+
+    if RE_DIMENSOES.match(valor):
+        largura, altura = interpretar_dimensoes(valor)
+        return largura * altura
+
+    raise ValueError(f"Área '{valor}' não reconhecida. Ex: 120 m2, 10x12 m")
+
+
+# ============ LOTES ============
+
+def converter_lote(valores: list, unidade: str = 'm') -> list:
+    """
+    Converte uma lista de valores numéricos de uma mesma unidade para metros.
+
+    Args:
+        valores: lista de números
+        unidade: 'mm', 'cm' ou 'm'
+
+    Returns:
+        Lista de valores em metros
+    """
+    divisor = _divisor(None, unidade)
+    if divisor == 1:
+        return list(valores)
+    return [v / divisor for v in valores]
+
+
+def interpretar_lote_medidas(valores: list, unidade_padrao: str = 'm') -> list:
+    """
+    Converte uma lista de medidas lineares (números ou textos) para metros.
+
+    Se todos os valores já forem numéricos, converte o lote de uma vez.
+    """
+    if all(isinstance(v, (int, float)) for v in valores):
+        return converter_lote(valores, unidade_padrao)
+    return [interpretar_medida(v, unidade_padrao) for v in valores]
+
+
+def _par_numerico(valor) -> bool:
+    """Verifica se o valor é um par [largura, altura] só com números"""
+    return (
+        isinstance(valor, (list, tuple)) and len(valor) == 2
+        and isinstance(valor[0], (int, float)) and isinstance(valor[1], (int, float))
+    )
+
+
+def interpretar_lote_dimensoes(valores: list, unidade_padrao: str = 'm') -> list:
+    """
+    Converte uma lista de dimensões ("LxA unidade" ou pares) para pares em metros.
+
+    Se todos os valores forem pares numéricos, converte larguras e alturas
+    de uma vez.
+    """
+    if all(_par_numerico(v) for v in valores):
+        larguras = converter_lote([v[0] for v in valores], unidade_padrao)
+        alturas = converter_lote([v[1] for v in valores], unidade_padrao)
+        return list(zip(larguras, alturas))
+    return [interpretar_dimensoes(v, unidade_padrao) for v in valores]
+
+
+def interpretar_lote_areas(valores: list) -> list:
+    """Converte uma lista de áreas (números ou textos) para m²"""
+    if all(isinstance(v, (int, float)) for v in valores):
+        return list(valores)
+    return [interpretar_area(v) for v in valores]
+
+
+# Teste rápido
+if __name__ == "__main__":
+    print(interpretar_lote_medidas(["3,5 m", "280cm", "900 mm", 2.8]))
+    print(interpretar_lote_dimensoes(["3.5x2.8 m", "350 x 280 cm", "3,5m x 280cm"]))
+    print(interpretar_lote_dimensoes([[350, 280], [420, 280]], 'cm'))
+    for invalido in [[3], [3, 2.8, 1], 3.5]:
+        try:
+            interpretar_dimensoes(invalido)
+        except ValueError as e:
+            print(e)
+    print(interpretar_lote_areas([120, "120 m2", "10x12 m"]))
+    print(converter_lote([900, 1200, 450], 'mm'))
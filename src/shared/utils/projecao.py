@@ -0,0 +1,90 @@
+# Projeção de campos
+# Reduz respostas da API aos campos pedidos em ?fields=
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def interpretar_campos(fields: str) -> dict:
+    """
+    Converte a lista de campos em uma árvore de projeção.
+
+    Campos aninhados usam ponto: 'blocos.id,blocos.nome,fabricante.nome'
+    vira {'blocos': {'id': {}, 'nome': {}}, 'fabricante': {'nome': {}}}.
+
+    Args:
+        fields: campos separados por vírgula
+
+    Returns:
+        Árvore de projeção (dict vazio = campo inteiro)
+    """
+    arvore = {}
+    for campo in fields.split(','):
+        campo = campo.strip()
+        if not campo:
+            continue
+
+        no = arvore
+        partes = campo.split('.')
+        for i, parte in enumerate(partes):
+            filho = no.get(parte)
+            if filho is None:
+                filho = {}
+                no[parte] = filho
+            elif not filho and i < len(partes) - 1:
+                # Campo já pedido inteiro, não restringe mais
+                break
+            no = filho
+        else:
+            # Campo pedido inteiro sobrepõe sub-campos pedidos antes
+            no.clear()
+
+    return arvore
+
+
+def _aplicar(dados, arvore: dict):
+    """Aplica a árvore de projeção recursivamente"""
+    if isinstance(dados, list):
+        return [_aplicar(item, arvore) for item in dados]
+
+    if isinstance(dados, dict):
+        resultado = {}
+        for chave, sub_arvore in arvore.items():
+            if chave in dados:
+                valor = dados[chave]
+                resultado[chave] = _aplicar(valor, sub_arvore) if sub_arvore else valor
+        return resultado
+
+    return dados
+
+
+def projetar_campos(dados, fields: str = None):
+    """
+    Mantém apenas os campos pedidos de um resultado.
+
+    Listas são projetadas item a item; campos inexistentes são ignorados.
+
+    Args:
+        dados: dict ou lista de dicts
+        fields: campos separados por vírgula (None = tudo)
+
+    Returns:
+        Dados projetados
+    """
+    if not fields:
+        return dados
+
+    arvore = interpretar_campos(fields)
+    if not arvore:
+        return dados
+
+    return _aplicar(dados, arvore)
+
+
+# Teste rápido
+if __name__ == "__main__":
+    calculo = {'produto': 'EPS 30mm', 'quantidade_placas': 240, 'custo_total': 2868.0, 'aplicacao': '...'}
+    print(projetar_campos([calculo], 'produto,custo_total'))
+
+    catalogo = {'fabricante': {'nome': 'Blocok', 'site': '...'}, 'blocos': [{'id': 1, 'nome': 'Blocok 10', 'peso_kg': 46}]}
+    print(projetar_campos(catalogo, 'blocos.id,blocos.nome'))